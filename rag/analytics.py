@@ -0,0 +1,192 @@
+"""Columnar analytics over the applications index (pyarrow.compute).
+
+Loads only the slim columns needed for group-by questions from
+``applications.jsonl`` (or the LanceDB ``applications`` table) straight into
+Arrow, then filters and aggregates with vectorized kernels — no per-row Python.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+GROUP_KEYS = ("method", "tag", "status", "company")
+
+_RESPONSE_FIELDS = ("Response", "Response Type", "Interview Stage")
+_OFFER_OR_REJECT_RE = r"offer|reject"
+_BLOCKED_RE = r"blocked|captcha"
+_RESPONSE_RE = (
+    r"interview|phone screen|screening|onsite|final round"
+    r"|recruiter|reached out|reply|responded|response"
+)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.compute as pc  # type: ignore
+    except Exception as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("pyarrow is required for analyze (pip install pyarrow)") from exc
+    return pa, pc
+
+
+def _slim_schema(pa):
+    return pa.schema(
+        [
+            pa.field("app_id", pa.string()),
+            pa.field("company", pa.string()),
+            pa.field("status", pa.string()),
+            pa.field("date_applied", pa.string()),
+            pa.field("application_method", pa.string()),
+            pa.field("tags", pa.list_(pa.string())),
+            pa.field(
+                "source_tracker_row",
+                pa.struct([pa.field(name, pa.string()) for name in _RESPONSE_FIELDS]),
+            ),
+        ]
+    )
+
+
+def _finalize(pa, pc, table):
+    """Parse dates and derive the ``responded`` flag column-wise."""
+    dates = pc.strptime(table["date_applied"], format="%Y-%m-%d", unit="s", error_is_null=True)
+    status = pc.fill_null(table["status"], "")
+
+    if "source_tracker_row" in table.column_names:
+        tracker = table["source_tracker_row"]
+        parts = [
+            pc.utf8_lower(pc.fill_null(pc.struct_field(tracker, name), ""))
+            for name in _RESPONSE_FIELDS
+        ]
+        combined = pc.binary_join_element_wise(*parts, " | ")
+    else:
+        combined = pa.array([""] * table.num_rows, pa.string())
+
+    # Mirrors cli._infer_tracker_outcome: offer/rejected win, blocked rows never
+    # count, and interview/response markers only count on Applied rows.
+    offer_or_reject = pc.or_(
+        pc.is_in(status, value_set=pa.array(["Offer", "Rejected"])),
+        pc.match_substring_regex(combined, _OFFER_OR_REJECT_RE),
+    )
+    blocked = pc.or_(
+        pc.equal(status, "Blocked"), pc.match_substring_regex(combined, _BLOCKED_RE)
+    )
+    replied = pc.and_(
+        pc.and_(pc.equal(status, "Applied"), pc.invert(blocked)),
+        pc.match_substring_regex(combined, _RESPONSE_RE),
+    )
+    responded = pc.or_(offer_or_reject, replied)
+
+    return pa.table(
+        {
+            "app_id": table["app_id"],
+            "company": pc.fill_null(table["company"], ""),
+            "status": status,
+            "method": pc.fill_null(table["application_method"], "direct"),
+            "tags": table["tags"],
+            "date_applied": pc.cast(dates, pa.date32()),
+            "applied": pc.equal(status, "Applied"),
+            "responded": responded,
+        }
+    )
+
+
+def load_applications_table(jsonl_path: Path):
+    """Read slim columns of ``applications.jsonl`` into an Arrow table."""
+    pa, pc = _require_pyarrow()
+    import pyarrow.json as pj  # type: ignore
+
+    if not Path(jsonl_path).exists() or Path(jsonl_path).stat().st_size == 0:
+        return _finalize(pa, pc, _slim_schema(pa).empty_table())
+    table = pj.read_json(
+        str(jsonl_path),
+        parse_options=pj.ParseOptions(
+            explicit_schema=_slim_schema(pa), unexpected_field_behavior="ignore"
+        ),
+    )
+    return _finalize(pa, pc, table)
+
+
+def load_lancedb_table(table):
+    """Project the slim columns out of an open LanceDB ``applications`` table.
+
+    The LanceDB table does not carry tracker response fields, so ``responded``
+    falls back to the status column (Offer/Rejected) for this source.
+    """
+    pa, pc = _require_pyarrow()
+    cols = ["app_id", "company", "status", "date_applied", "application_method", "tags"]
+    try:
+        arrow = table.to_lance().to_table(columns=cols)
+    except Exception:
+        arrow = table.to_arrow().select(cols)
+    return _finalize(pa, pc, arrow)
+
+
+def filter_applications(
+    table,
+    *,
+    days: Optional[int] = None,
+    today: Optional[date] = None,
+    status: Optional[str] = None,
+    method: Optional[str] = None,
+):
+    """Apply date-window / status / method predicates as one boolean mask."""
+    pa, pc = _require_pyarrow()
+    mask = pa.array([True] * table.num_rows, pa.bool_())
+    if days is not None:
+        cutoff = (today or date.today()) - timedelta(days=max(0, int(days)))
+        in_window = pc.greater_equal(table["date_applied"], pa.scalar(cutoff, pa.date32()))
+        mask = pc.and_(mask, pc.fill_null(in_window, False))
+    if status:
+        mask = pc.and_(mask, pc.equal(table["status"], status))
+    if method:
+        mask = pc.and_(mask, pc.equal(table["method"], method.lower()))
+    return table.filter(mask)
+
+
+def aggregate_applications(table, by: Sequence[str]) -> List[Dict[str, Any]]:
+    """Group by ``by`` (subset of GROUP_KEYS) and return count/response stats.
+
+    Grouping by ``tag`` explodes the tag lists first, so a row tagged
+    ``ai;remote`` counts once under each tag.
+    """
+    pa, pc = _require_pyarrow()
+    keys = [k for k in by if k]
+    unknown = [k for k in keys if k not in GROUP_KEYS]
+    if unknown:
+        raise ValueError(f"unknown group key(s): {', '.join(unknown)}")
+
+    if "tag" in keys:
+        parents = pc.list_parent_indices(table["tags"])
+        flat = table.drop_columns(["tags"]).take(parents)
+        table = flat.append_column("tag", pc.list_flatten(table["tags"]))
+
+    if not keys:
+        table = table.append_column("all", pa.array([""] * table.num_rows, pa.string()))
+        keys = ["all"]
+
+    work = table.select(keys).append_column(
+        "applied_i", pc.cast(table["applied"], pa.int64())
+    ).append_column("responded_i", pc.cast(table["responded"], pa.int64()))
+    grouped = work.group_by(keys).aggregate(
+        [
+            ("applied_i", "count"),
+            ("applied_i", "sum"),
+            ("responded_i", "sum"),
+        ]
+    )
+    count = grouped["applied_i_count"]
+    responded = grouped["responded_i_sum"]
+    rate = pc.divide(pc.cast(responded, pa.float64()), pc.max_element_wise(count, 1))
+    result = pa.table(
+        {
+            **{k: grouped[k] for k in keys if k != "all"},
+            "count": count,
+            "applied": grouped["applied_i_sum"],
+            "responded": responded,
+            "response_rate": pc.round(rate, 4),
+        }
+    )
+    order = [("count", "descending")] + [(k, "ascending") for k in keys if k != "all"]
+    return result.sort_by(order).to_pylist()
@@ -0,0 +1,176 @@
+"""Arrow-native tracker ingest (pyarrow.csv + pyarrow.compute).
+
+Columnar counterpart of ``csv.DictReader`` + ``memalign.normalize_row``: the
+tracker is parsed with an explicit all-string schema and ``Status``, ``Tags``,
+``app_id`` and ``application_method`` are derived with vectorized string/regex
+kernels. ``app_id`` keeps the sha256 suffix of ``memalign.stable_id``, the only
+per-row step (Arrow has no sha256 kernel). Embeddings are packed into a
+``FixedSizeList`` column straight from a 2-D float32 matrix.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from memalign import ATS_PATTERNS
+
+# memalign.normalize_status mapping (lowercased key -> canonical status).
+_STATUS_MAP = {
+    "applied": "Applied",
+    "draft": "Draft",
+    "in progress": "Draft",
+    "closed": "Closed",
+    "blocked": "Blocked",
+    "rejected": "Rejected",
+    "offer": "Offer",
+}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.compute as pc  # type: ignore
+    except Exception as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "pyarrow is required for --ingest arrow (pip install pyarrow)"
+        ) from exc
+    return pa, pc
+
+
+def _tracker_header(csv_path: Path) -> List[str]:
+    with Path(csv_path).open("r", newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), [])
+
+
+def read_tracker_table(csv_path: Path):
+    """Tracker CSV as an all-string Arrow table, fully blank rows dropped."""
+    pa, pc = _require_pyarrow()
+    import pyarrow.csv as pcsv  # type: ignore
+
+    header = _tracker_header(csv_path)
+    if not header:
+        return pa.table({})
+    table = pcsv.read_csv(
+        str(csv_path),
+        read_options=pcsv.ReadOptions(column_names=header, skip_rows=1),
+        parse_options=pcsv.ParseOptions(newlines_in_values=True),
+        convert_options=pcsv.ConvertOptions(
+            column_types={name: pa.string() for name in header},
+            strings_can_be_null=False,
+            quoted_strings_can_be_null=False,
+        ),
+    )
+    if table.num_rows == 0:
+        return table
+    keep = None
+    for col in table.columns:
+        filled = pc.not_equal(pc.utf8_trim_whitespace(col), "")
+        keep = filled if keep is None else pc.or_(keep, filled)
+    return table.filter(keep)
+
+
+def _slug(pc, values):
+    """Vectorized ``memalign.slug``."""
+    lowered = pc.utf8_lower(pc.utf8_trim_whitespace(values))
+    dashed = pc.replace_substring_regex(lowered, pattern="[^a-z0-9]+", replacement="-")
+    trimmed = pc.utf8_trim(dashed, characters="-")
+    return pc.if_else(pc.equal(trimmed, ""), "unknown", trimmed)
+
+
+def _status(pa, pc, values):
+    """Vectorized ``memalign.normalize_status``."""
+    stripped = pc.utf8_trim_whitespace(values)
+    keys = pa.array(list(_STATUS_MAP))
+    idx = pc.index_in(pc.utf8_lower(stripped), value_set=keys)
+    mapped = pc.take(pa.array(list(_STATUS_MAP.values())), idx)
+    fallback = pc.if_else(pc.equal(stripped, ""), "Draft", stripped)
+    return pc.coalesce(mapped, fallback)
+
+
+def _tags(pa, pc, values):
+    """Vectorized ``memalign.parse_tags``: split on ';', trim, drop empties."""
+    split = pc.split_pattern(values, pattern=";")
+    flat = pc.utf8_trim_whitespace(pc.list_flatten(split))
+    parents = pc.list_parent_indices(split)
+    keep = pc.not_equal(flat, "")
+    flat = flat.filter(keep)
+    counts = np.bincount(
+        parents.filter(keep).to_numpy(zero_copy_only=False), minlength=len(values)
+    )
+    offsets = np.zeros(len(values) + 1, dtype=np.int32)
+    np.cumsum(counts, out=offsets[1:])
+    return pa.ListArray.from_arrays(pa.array(offsets), flat)
+
+
+def _method(pa, pc, urls):
+    """Vectorized ``memalign.infer_application_method`` (first pattern wins)."""
+    lowered = pc.utf8_lower(urls)
+    method = pa.array(["direct"] * len(urls), pa.string())
+    for name, pattern in reversed(ATS_PATTERNS):
+        method = pc.if_else(
+            pc.match_substring_regex(lowered, pattern.pattern), name, method
+        )
+    return method
+
+
+def normalize_tracker_table(table):
+    """Append ``Status``/``Tags``/``app_id``/``application_method`` like normalize_row."""
+    pa, pc = _require_pyarrow()
+    n = table.num_rows
+
+    def col(name):
+        if name in table.column_names:
+            return pc.fill_null(table[name].combine_chunks(), "")
+        return pa.array([""] * n, pa.string())
+
+    company, role = _slug(pc, col("Company")), _slug(pc, col("Role"))
+    url = pc.utf8_trim_whitespace(col("Career Page URL"))
+    base = pc.binary_join_element_wise(company, role, url, "__")
+    prefix = pc.binary_join_element_wise(company, role, "__")
+    digests = pa.array(
+        [hashlib.sha256(b.encode("utf-8")).hexdigest()[:10] for b in base.to_pylist()],
+        pa.string(),
+    )
+    app_id = pc.binary_join_element_wise(prefix, digests, "__")
+
+    derived = {
+        "Status": _status(pa, pc, col("Status")),
+        "Tags": _tags(pa, pc, col("Tags")),
+        "app_id": app_id,
+        "application_method": _method(pa, pc, col("Career Page URL")),
+    }
+    for name, values in derived.items():
+        if name in table.column_names:
+            table = table.set_column(table.column_names.index(name), name, values)
+        else:
+            table = table.append_column(name, values)
+    return table
+
+
+def first_occurrence(table, key: str = "app_id"):
+    """Keep the first row per ``key`` (tracker order), like the row path's seen-set."""
+    pa, pc = _require_pyarrow()
+    if table.num_rows == 0:
+        return table
+    idx = pa.array(np.arange(table.num_rows, dtype=np.int64))
+    firsts = (
+        pa.table({"k": table[key], "i": idx})
+        .group_by("k", use_threads=False)
+        .aggregate([("i", "min")])
+    )
+    keep = pc.sort_indices(firsts["i_min"])
+    return table.take(pc.take(firsts["i_min"], keep))
+
+
+def vectors_from_matrix(matrix: np.ndarray):
+    """``FixedSizeList<float32>[dims]`` over a C-contiguous (rows, dims) matrix, no copy."""
+    pa, _pc = _require_pyarrow()
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    rows, dims = matrix.shape
+    flat = pa.array(matrix.reshape(-1), type=pa.float32())
+    return pa.FixedSizeListArray.from_arrays(flat, dims)
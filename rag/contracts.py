@@ -1,11 +1,22 @@
 """Structured contracts for agent-facing RAG endpoints."""
 
+import base64
+import hashlib
+import json
+import re
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 
 CONTRACT_RETRIEVE_V1 = "rag.retrieve.v1"
+CONTRACT_RETRIEVE_V2 = "rag.retrieve.v2"
 CONTRACT_VERSION = "2026-02-19"
+CONTRACT_VERSION_V2 = "2026-10-18"
+
+# v2 pages through one frozen ranking: k is the page size, the cursor the offset.
+# The ranking (hence any cursor offset) is at most RETRIEVE_V2_MAX_RESULTS deep.
+RETRIEVE_V2_MAX_PAGE = 200
+RETRIEVE_V2_MAX_RESULTS = 1000
 
 RETRIEVE_ENVELOPE_SCHEMA: Dict[str, Any] = {
     "type": "object",
@@ -28,6 +39,42 @@ RETRIEVE_ENVELOPE_SCHEMA: Dict[str, Any] = {
 }
 
 
+# rag.retrieve.v2 is NDJSON: one header line, one line per item, one end line.
+RETRIEVE_V2_LINE_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "header": {
+        "required": [
+            "type",
+            "contract",
+            "contract_version",
+            "provider",
+            "generated_at",
+            "index_version",
+            "offset",
+            "request",
+        ],
+    },
+    "item": {
+        "required": [
+            "type",
+            "rank",
+            "app_id",
+            "company",
+            "role",
+            "status",
+            "method",
+            "tags",
+            "score",
+            "context",
+            "evidence",
+        ],
+    },
+    "end": {"required": ["type", "count", "total", "next_cursor"]},
+}
+
+
+_DATE_BOUND_RE = re.compile(r"^\d{4}-\d{2}(?:-\d{2})?$")
+
+
 class ContractError(ValueError):
     """Raised when a payload does not satisfy a contract."""
 
@@ -46,12 +93,16 @@ def build_retrieve_request(
     k: int,
     status: Optional[str],
     method: Optional[str],
+    since: Optional[str] = None,
+    until: Optional[str] = None,
 ) -> Dict[str, Any]:
     req = {
         "query": (query or "").strip(),
         "k": int(k),
         "status": (status or "").strip() or None,
         "method": (method or "").strip() or None,
+        "since": (since or "").strip() or None,
+        "until": (until or "").strip() or None,
     }
     validate_retrieve_request(req)
     return req
@@ -82,6 +133,28 @@ def validate_retrieve_request(payload: Dict[str, Any]) -> None:
         if len(value.strip()) > 120:
             raise ContractError(f"retrieve request {key} exceeds 120 characters")
 
+    for key in ("since", "until"):
+        value = payload.get(key)
+        if value is None:
+            continue
+        if not isinstance(value, str) or not _is_date_bound(value):
+            raise ContractError(
+                f"retrieve request {key} must be YYYY-MM or YYYY-MM-DD or null"
+            )
+    since, until = payload.get("since"), payload.get("until")
+    if since and until and since[:len(until)] > until:
+        raise ContractError("retrieve request since must not be after until")
+
+
+def _is_date_bound(value: str) -> bool:
+    if not _DATE_BOUND_RE.match(value):
+        return False
+    try:
+        datetime.strptime(value if len(value) == 10 else f"{value}-01", "%Y-%m-%d")
+    except ValueError:
+        return False
+    return True
+
 
 def _canonicalize_retrieve_item(item: Dict[str, Any]) -> Dict[str, Any]:
     return {
@@ -152,3 +225,191 @@ def build_retrieve_envelope(
         "request": request,
         "results": validated,
     }
+
+
+def build_retrieve_request_v2(
+    *,
+    query: str,
+    k: int,
+    status: Optional[str],
+    method: Optional[str],
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    req = build_retrieve_request(
+        query=query, k=k, status=status, method=method, since=since, until=until
+    )
+    req["cursor"] = (cursor or "").strip() or None
+    validate_retrieve_request_v2(req)
+    return req
+
+
+def validate_retrieve_request_v2(payload: Dict[str, Any]) -> None:
+    validate_retrieve_request(payload)
+    cursor = payload.get("cursor")
+    if cursor is None:
+        return
+    if not isinstance(cursor, str) or not cursor:
+        raise ContractError(
+            "retrieve request cursor must be a non-empty string or null"
+        )
+    if len(cursor) > 512:
+        raise ContractError("retrieve request cursor exceeds 512 characters")
+
+
+def retrieve_request_fingerprint(request: Dict[str, Any]) -> str:
+    """Stable id of the ranking a request asks for (page size and cursor excluded)."""
+    key = {k: v for k, v in request.items() if k not in ("k", "cursor")}
+    blob = json.dumps(key, sort_keys=True, ensure_ascii=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_retrieve_cursor(
+    *, request: Dict[str, Any], index_version: str, offset: int
+) -> str:
+    body = {
+        "v": str(index_version),
+        "f": retrieve_request_fingerprint(request),
+        "o": int(offset),
+    }
+    raw = json.dumps(body, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_retrieve_cursor(
+    cursor: str, *, request: Dict[str, Any], index_version: str
+) -> int:
+    """Offset encoded in ``cursor``; rejects cursors from another request or index."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        body = json.loads(raw.decode("utf-8"))
+        offset = int(body["o"])
+        version, fingerprint = str(body["v"]), str(body["f"])
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise ContractError("retrieve cursor is malformed") from None
+    if fingerprint != retrieve_request_fingerprint(request):
+        raise ContractError("retrieve cursor does not match this request")
+    if version != str(index_version):
+        raise ContractError(
+            "retrieve cursor is stale: the index or learning state changed"
+        )
+    if offset < 0 or offset > RETRIEVE_V2_MAX_RESULTS:
+        raise ContractError("retrieve cursor offset is out of range")
+    return offset
+
+
+def iter_validated_retrieve_items(
+    items: Iterable[Dict[str, Any]], *, limit: int = RETRIEVE_V2_MAX_RESULTS
+) -> Iterator[Dict[str, Any]]:
+    """Validate ``items`` one at a time, without materializing the sequence."""
+    for n, item in enumerate(items, start=1):
+        if n > limit:
+            raise ContractError(f"retrieve payload cannot exceed {limit} results")
+        yield validate_retrieve_item(item)
+
+
+def _ndjson(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=True, separators=(",", ":"))
+
+
+def iter_retrieve_ndjson(
+    *,
+    request: Dict[str, Any],
+    results: Iterable[Dict[str, Any]],
+    provider: str,
+    index_version: str,
+    offset: int = 0,
+    total: int = 0,
+) -> Iterator[str]:
+    """Yield the ``rag.retrieve.v2`` stream for one page of a ranking.
+
+    ``results`` is the page starting at ``offset`` and ``total`` the length of
+    the whole ranking; the end line carries the cursor of the next page.
+    """
+    validate_retrieve_request_v2(request)
+    if not isinstance(provider, str) or not provider.strip():
+        raise ContractError("provider must be a non-empty string")
+
+    yield _ndjson(
+        {
+            "type": "header",
+            "contract": CONTRACT_RETRIEVE_V2,
+            "contract_version": CONTRACT_VERSION_V2,
+            "provider": provider.strip(),
+            "generated_at": _utc_now(),
+            "index_version": str(index_version),
+            "offset": int(offset),
+            "request": request,
+        }
+    )
+    count = 0
+    for item in iter_validated_retrieve_items(results, limit=RETRIEVE_V2_MAX_PAGE):
+        yield _ndjson({"type": "item", "rank": offset + count, **item})
+        count += 1
+    following = offset + count
+    yield _ndjson(
+        {
+            "type": "end",
+            "count": count,
+            "total": int(total),
+            "next_cursor": encode_retrieve_cursor(
+                request=request, index_version=index_version, offset=following
+            )
+            if count and following < total
+            else None,
+        }
+    )
+
+
+def iter_retrieve_ndjson_items(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Parse and validate a ``rag.retrieve.v2`` stream line by line.
+
+    Yields each validated item, with its ``rank``, as it arrives; raises
+    ``ContractError`` on a missing header, a malformed line, ranks that do not
+    run on from the header's ``offset`` or an end line that miscounts the items.
+    """
+    state = "header"
+    count = 0
+    offset = 0
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            raise ContractError(f"retrieve stream line {number} is not JSON") from None
+        kind = payload.get("type") if isinstance(payload, dict) else None
+        schema = RETRIEVE_V2_LINE_SCHEMAS.get(str(kind))
+        if schema is None:
+            raise ContractError(f"retrieve stream line {number} has unknown type")
+        missing = [k for k in schema["required"] if k not in payload]
+        if missing:
+            raise ContractError(
+                f"retrieve stream {kind} line is missing {', '.join(missing)}"
+            )
+        if state == "header":
+            if kind != "header" or payload["contract"] != CONTRACT_RETRIEVE_V2:
+                raise ContractError("retrieve stream must start with a v2 header")
+            validate_retrieve_request_v2(payload["request"])
+            offset = payload["offset"]
+            if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+                raise ContractError("retrieve stream header offset must be an int >= 0")
+            state = "items"
+        elif state == "done" or kind == "header":
+            raise ContractError(f"retrieve stream line {number} is out of place")
+        elif kind == "item":
+            rank = payload["rank"]
+            if isinstance(rank, bool) or rank != offset + count:
+                raise ContractError(
+                    f"retrieve stream line {number} has rank {rank!r}, "
+                    f"expected {offset + count}"
+                )
+            count += 1
+            yield {"rank": rank, **validate_retrieve_item(payload)}
+        else:
+            if payload["count"] != count:
+                raise ContractError("retrieve stream end count does not match items")
+            state = "done"
+    if state != "done":
+        raise ContractError("retrieve stream ended without an end line")
@@ -6,9 +6,10 @@ Design goals:
 - Explicit failure in mode='on' when distributed prerequisites are missing.
 """
 
+import heapq
 import os
 from dataclasses import dataclass
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 
 @dataclass
@@ -163,3 +164,32 @@ def create_runtime(
         _dist=dist,
         _initialized_here=initialized_here,
     )
+
+
+def plan_lpt(
+    costs: Mapping[str, float], bins: int
+) -> Tuple[Dict[str, int], List[float]]:
+    """Longest-processing-time-first bin packing.
+
+    Items go heaviest first to the currently least-loaded bin. Ties break on
+    item key and bin index, so every rank derives the same plan from the same
+    inputs. Returns (item -> bin, per-bin load).
+    """
+    bins = max(1, int(bins))
+    loads = [0.0] * bins
+    heap = [(0.0, b) for b in range(bins)]
+    assignment: Dict[str, int] = {}
+    for key, cost in sorted(costs.items(), key=lambda kv: (-float(kv[1]), kv[0])):
+        load, b = heapq.heappop(heap)
+        assignment[key] = b
+        loads[b] = load + float(cost)
+        heapq.heappush(heap, (loads[b], b))
+    return assignment, loads
+
+
+def load_skew(loads: Sequence[float]) -> float:
+    """max/mean load; 1.0 is perfectly balanced."""
+    if not loads:
+        return 1.0
+    mean = sum(loads) / len(loads)
+    return max(loads) / mean if mean > 0 else 1.0
@@ -3,18 +3,22 @@
 This module turns the persisted Thompson-sampling arms into:
 - machine-readable learning reports
 - deterministic priority scores for ReadyToSubmit / Draft rows
+- a columnar (Parquet) history of report snapshots for trend queries
 """
 
 from __future__ import annotations
 
 import csv
+import heapq
 import json
 import math
 import re
 from collections import Counter, defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 _NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
 _ATS_PATTERNS: Sequence[Tuple[str, re.Pattern[str]]] = (
@@ -178,35 +182,292 @@ def learning_features_for_row(
     }
 
 
+def _row_field(row: Dict[str, Any], title: str, snake: str) -> str:
+    return str(row.get(title, "") or row.get(snake, "")).strip()
+
+
+# Raw fields behind a row's cached static features (see RankingContext).
+_STATIC_FIELDS = (
+    "Company",
+    "company",
+    "Role",
+    "role",
+    "Career Page URL",
+    "career_page_url",
+    "Submission Lane",
+    "submission_lane",
+    "Tags",
+    "tags",
+)
+
+
+def row_base_features(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Arm-independent features: method, parsed tags and notes marker flags."""
+    tags = row.get("Tags")
+    if isinstance(tags, list):
+        tag_list = [str(tag).strip() for tag in tags if str(tag).strip()]
+    else:
+        tag_list = parse_tags(str(tags or row.get("tags", "")))
+    notes = str(row.get("Notes", "") or row.get("notes", "")).lower()
+    return {
+        "method": infer_application_method(
+            _row_field(row, "Career Page URL", "career_page_url")
+        ),
+        "tags": tag_list,
+        "antibot": any(marker in notes for marker in _ANTIBOT_MARKERS),
+        "manual": any(marker in notes for marker in _MANUAL_BLOCK_MARKERS),
+    }
+
+
+class RankingContext:
+    """Precompiled arm lookups and per-row feature cache for repeated ranking.
+
+    Scores match ``learning_features_for_row``. Arm means are computed once into
+    arrays; each row's static features (method, tags and their arm stats, lane)
+    are cached by row position and only rebuilt when those fields change, and
+    the notes flags only when the notes change. ``rank`` then scores all
+    selected rows in one numpy pass. Arm-dependent features are only built for
+    rows that get ranked.
+    """
+
+    def __init__(self, arms: Dict[str, Dict[str, Any]]) -> None:
+        self.arms = arms
+        methods = sorted(name for name in arms if name.startswith("method:"))
+        self._method_index = {name[len("method:"):]: i for i, name in enumerate(methods)}
+        # Trailing slot: no arm for the method (mean 0.5, no evidence).
+        self._method_mean = np.array([arm_mean(arms[n]) for n in methods] + [0.5])
+        self._method_pulls = [int((arms[n] or {}).get("pulls", 0) or 0) for n in methods]
+        self._tag_stats = {
+            name[len("cat:"):]: (round(arm_mean(arm), 4), int(arm.get("pulls", 0) or 0))
+            for name, arm in arms.items()
+            if name.startswith("cat:") and arm is not None
+        }
+        self._static: List[Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]]] = []
+        self._notes: List[Any] = []
+        self._status_memo: Dict[Any, Tuple[str, bool, bool]] = {}
+        self._method_idx = np.zeros(0, dtype=np.int64)
+        self._tag_sum = np.zeros(0)
+        self._tag_n = np.zeros(0)
+        self._antibot = np.zeros(0)
+        self._manual = np.zeros(0)
+
+    def _resize(self, n: int) -> None:
+        if len(self._static) == n:
+            return
+        grow = max(0, n - len(self._static))
+        self._static = self._static[:n] + [None] * grow
+        self._notes = self._notes[:n] + [None] * grow
+        for name in ("_method_idx", "_tag_sum", "_tag_n", "_antibot", "_manual"):
+            arr = getattr(self, name)
+            setattr(self, name, np.concatenate([arr[:n], np.zeros(grow, arr.dtype)]))
+
+    def _static_features(self, key: Tuple[Any, ...], base: Dict[str, Any]) -> Dict[str, Any]:
+        company, role, url, lane = (
+            str(key[j] or key[j + 1] or "").strip() for j in (0, 2, 4, 6)
+        )
+        return {
+            "company": company,
+            "role": role,
+            "company_key": company.lower(),
+            "role_key": role.lower(),
+            "career_page_url": url,
+            "submission_lane": lane,
+            "method": base["method"],
+            "tags": base["tags"],
+            "lane_priority": 0 if lane.startswith("ci_auto") else 1,
+        }
+
+    def _arm_features(self, i: int, static: Dict[str, Any]) -> None:
+        """Fill row ``i``'s arm lookups into ``static`` and the score arrays."""
+        midx = self._method_index.get(static["method"], len(self._method_pulls))
+        # (mean_reward, pulls, tag) sorts like learning_features_for_row's metrics.
+        tag_metrics = sorted(
+            (self._tag_stats[tag] + (tag,) for tag in static["tags"] if tag in self._tag_stats),
+            reverse=True,
+        )
+        static["method_pulls"] = (
+            self._method_pulls[midx] if midx < len(self._method_pulls) else 0
+        )
+        static["matched_positive_tags"] = [
+            tag for mean, _pulls, tag in tag_metrics if mean >= 0.55
+        ][:6]
+        static["matched_negative_tags"] = [
+            tag for mean, pulls, tag in tag_metrics if pulls >= 2 and mean <= 0.45
+        ][:6]
+        static["armed"] = True
+        self._method_idx[i] = midx
+        self._tag_sum[i] = sum(mean for mean, _pulls, _tag in tag_metrics)
+        self._tag_n[i] = len(tag_metrics)
+
+    def _refresh(self, i: int, row: Dict[str, Any]) -> Dict[str, Any]:
+        key = tuple(map(row.get, _STATIC_FIELDS))
+        if isinstance(key[8], list):
+            key = key[:8] + (tuple(key[8]),) + key[9:]
+        raw_notes = row.get("Notes", "") or row.get("notes", "")
+        cached = self._static[i]
+        static_stale = cached is None or cached[0] != key
+        if not static_stale and self._notes[i] == raw_notes:
+            return cached[1]
+        base = row_base_features(row)
+        if static_stale:
+            static = self._static_features(key, base)
+            self._static[i] = (key, static)
+        else:
+            static = cached[1]
+        self._notes[i] = raw_notes
+        self._antibot[i] = base["antibot"]
+        self._manual[i] = base["manual"]
+        return static
+
+    def _status(self, row: Dict[str, Any]) -> Tuple[str, bool, bool]:
+        """(stripped status, is ready, is draft), memoized per raw value."""
+        raw = row.get("Status", "") or row.get("status", "")
+        hit = self._status_memo.get(raw)
+        if hit is None:
+            status = str(raw).strip()
+            hit = (status, is_ready_status(status), is_draft_status(status))
+            self._status_memo[raw] = hit
+        return hit
+
+    def scan(
+        self, rows: Sequence[Dict[str, Any]]
+    ) -> List[Tuple[Tuple[str, bool, bool], Dict[str, Any], bool, bool]]:
+        """Refresh every row; per row ``(_status(row), static, antibot, manual)``."""
+        self._resize(len(rows))
+        hits = [self._status(row) for row in rows]
+        statics = [self._refresh(i, row) for i, row in enumerate(rows)]
+        return list(
+            zip(hits, statics, self._antibot.tolist(), self._manual.tolist(), strict=True)
+        )
+
+    def rank(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        *,
+        status_filter: str = "ready",
+        max_rows: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Same contract as ``rank_rows_by_learning``."""
+        self._resize(len(rows))
+        selected: List[int] = []
+        statuses: List[str] = []
+        for idx, row in enumerate(rows):
+            hit = self._status(row)
+            if _status_excluded(hit, status_filter):
+                continue
+            selected.append(idx)
+            statuses.append(hit[0])
+        statics = [self._refresh(i, rows[i]) for i in selected]
+        return self._ranked(selected, statuses, statics, max_rows)
+
+    def _ranked(
+        self,
+        selected: List[int],
+        statuses: List[str],
+        statics: List[Dict[str, Any]],
+        max_rows: int,
+    ) -> List[Dict[str, Any]]:
+        if not selected:
+            return []
+        for i, static in zip(selected, statics, strict=True):
+            if "armed" not in static:
+                self._arm_features(i, static)
+        sel = np.asarray(selected, dtype=np.int64)
+        midx = self._method_idx[sel]
+        tag_n = self._tag_n[sel]
+        method_mean = self._method_mean[midx]
+        tag_mean = np.where(tag_n > 0, self._tag_sum[sel] / np.maximum(tag_n, 1), 0.5)
+        has_method = (midx < len(self._method_pulls)).astype(np.float64)
+        evidence_bonus = np.minimum(0.08, 0.01 * (has_method + tag_n))
+        learned = np.minimum(1.0, 0.52 * method_mean + 0.40 * tag_mean + evidence_bonus)
+        antibot = self._antibot[sel]
+        manual = self._manual[sel]
+        adjusted = np.maximum(0.0, learned - 0.04 * antibot - 0.03 * manual)
+
+        # Order on the rounded score like the per-row path, then build output
+        # dicts only for the rows that survive ``max_rows``.
+        adjusted_r = [round(x, 4) for x in adjusted.tolist()]
+
+        def order_key(j: int) -> Tuple[int, float, str, str]:
+            static = statics[j]
+            return (
+                static["lane_priority"],
+                -adjusted_r[j],
+                static["company_key"],
+                static["role_key"],
+            )
+
+        if max_rows > 0:
+            order = heapq.nsmallest(max_rows, range(len(selected)), key=order_key)
+        else:
+            order = sorted(range(len(selected)), key=order_key)
+
+        ranked: List[Dict[str, Any]] = []
+        for j in order:
+            static = statics[j]
+            ranked.append(
+                {
+                    "company": static["company"],
+                    "role": static["role"],
+                    "status": statuses[j],
+                    "career_page_url": static["career_page_url"],
+                    "submission_lane": static["submission_lane"],
+                    "method": static["method"],
+                    "tags": list(static["tags"]),
+                    "method_mean_reward": round(float(method_mean[j]), 4),
+                    "method_pulls": static["method_pulls"],
+                    "tag_mean_reward": round(float(tag_mean[j]), 4),
+                    "matched_positive_tags": list(static["matched_positive_tags"]),
+                    "matched_negative_tags": list(static["matched_negative_tags"]),
+                    "learned_score": round(float(learned[j]), 4),
+                    "adjusted_score": adjusted_r[j],
+                    "lane_priority": static["lane_priority"],
+                    "antibot_history": bool(antibot[j]),
+                    "manual_history": bool(manual[j]),
+                    "row_index": selected[j],
+                }
+            )
+        return ranked
+
+
+def _status_excluded(hit: Tuple[str, bool, bool], status_filter: str) -> bool:
+    if status_filter == "ready":
+        return not hit[1]
+    if status_filter == "draft":
+        return not hit[2]
+    return False
+
+
+_CONTEXTS: Dict[str, Tuple[Optional[Tuple[int, int]], RankingContext]] = {}
+
+
+def ranking_context_for(path: Path) -> RankingContext:
+    """Shared ``RankingContext`` for an arms file, reloaded only when it changes."""
+    try:
+        st = path.stat()
+        stamp: Optional[Tuple[int, int]] = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+    cached = _CONTEXTS.get(str(path))
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    context = RankingContext(load_arms(path))
+    _CONTEXTS[str(path)] = (stamp, context)
+    return context
+
+
 def rank_rows_by_learning(
     rows: Sequence[Dict[str, Any]],
     arms: Dict[str, Dict[str, Any]],
     *,
     status_filter: str = "ready",
     max_rows: int = 0,
+    context: Optional[RankingContext] = None,
 ) -> List[Dict[str, Any]]:
-    ranked: List[Dict[str, Any]] = []
-    for idx, row in enumerate(rows):
-        status = str(row.get("Status", "") or row.get("status", "")).strip()
-        if status_filter == "ready" and not is_ready_status(status):
-            continue
-        if status_filter == "draft" and not is_draft_status(status):
-            continue
-        features = learning_features_for_row(row, arms)
-        features["row_index"] = idx
-        ranked.append(features)
-
-    ranked.sort(
-        key=lambda item: (
-            item["lane_priority"],
-            -float(item["adjusted_score"]),
-            item["company"].lower(),
-            item["role"].lower(),
-        )
-    )
-    if max_rows > 0:
-        return ranked[: max_rows]
-    return ranked
+    """Rank rows by learned score; pass ``context`` to reuse cached features."""
+    if context is None:
+        context = RankingContext(arms)
+    return context.rank(rows, status_filter=status_filter, max_rows=max_rows)
 
 
 def build_learning_report(
@@ -216,8 +477,18 @@ def build_learning_report(
     top_k: int = 10,
     tracker_csv: str = "",
     arms_json: str = "",
+    context: Optional[RankingContext] = None,
 ) -> Dict[str, Any]:
-    status_counts = Counter(str(row.get("Status", "")).strip() or "Unknown" for row in tracker_rows)
+    """Learning report from one pass over ``tracker_rows``.
+
+    Status counts, method friction and both rankings share the per-row
+    features of ``context``. Reuse one context (built over ``arms``) across
+    reports and only rows whose fields changed are recomputed.
+    """
+    if context is None:
+        context = RankingContext(arms)
+    scanned = context.scan(tracker_rows)
+    status_counts: Counter = Counter()
     method_friction: Dict[str, Dict[str, Any]] = defaultdict(
         lambda: {
             "rows": 0,
@@ -228,20 +499,28 @@ def build_learning_report(
         }
     )
 
-    for row in tracker_rows:
-        method = infer_application_method(str(row.get("Career Page URL", "")).strip())
-        status = str(row.get("Status", "")).strip()
-        notes = str(row.get("Notes", "")).lower()
-        bucket = method_friction[method]
+    ranking: Dict[str, Tuple[List[int], List[str], List[Dict[str, Any]]]] = {
+        "ready": ([], [], []),
+        "draft": ([], [], []),
+    }
+    for idx, (hit, static, antibot, manual) in enumerate(scanned):
+        status = hit[0]
+        status_counts[status or "Unknown"] += 1
+        bucket = method_friction[static["method"]]
         bucket["rows"] += 1
-        if is_ready_status(status):
+        if hit[1]:
             bucket["ready_rows"] += 1
         if status == "Applied":
             bucket["applied_rows"] += 1
-        if any(marker in notes for marker in _ANTIBOT_MARKERS):
+        if antibot:
             bucket["antibot_count"] += 1
-        if any(marker in notes for marker in _MANUAL_BLOCK_MARKERS) or status == "Quarantined":
+        if manual or status == "Quarantined":
             bucket["manual_block_count"] += 1
+        for status_filter, (selected, statuses, statics) in ranking.items():
+            if not _status_excluded(hit, status_filter):
+                selected.append(idx)
+                statuses.append(status)
+                statics.append(static)
 
     method_summary: List[Dict[str, Any]] = []
     category_summary: List[Dict[str, Any]] = []
@@ -267,8 +546,8 @@ def build_learning_report(
         key=lambda item: (-float(item["mean_reward"]), -int(item["pulls"]), item["arm"])
     )
 
-    ready_ranked = rank_rows_by_learning(tracker_rows, arms, status_filter="ready", max_rows=top_k)
-    draft_ranked = rank_rows_by_learning(tracker_rows, arms, status_filter="draft", max_rows=top_k)
+    ready_ranked = context._ranked(*ranking["ready"], top_k)
+    draft_ranked = context._ranked(*ranking["draft"], top_k)
     manual_rescue_queue = [
         item
         for item in ready_ranked
@@ -317,5 +596,152 @@ def build_learning_report(
         "draft_ranked": draft_ranked,
         "manual_rescue_queue": manual_rescue_queue,
         "action_summary": action_summary,
+        "method_friction": {k: dict(v) for k, v in sorted(method_friction.items())},
     }
 
+
+# ---------------------------------------------------------------------------
+# Snapshot history (Parquet, hive-partitioned by month)
+# ---------------------------------------------------------------------------
+
+_SNAPSHOT_DATASET = "learning"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.dataset as ds  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+    except Exception as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "pyarrow is required for learning history (pip install pyarrow)"
+        ) from exc
+    return pa, ds, pq
+
+
+def _iso_to_epoch_ms(ts: str) -> Optional[int]:
+    raw = (ts or "").strip()
+    if raw.endswith("Z"):
+        raw = raw[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(raw)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+def learning_snapshot_rows(
+    report: Dict[str, Any], arms: Dict[str, Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Flatten one report into long-format (kind, key, metric, value) rows.
+
+    Arm stats come from the full arms mapping rather than the top_k-truncated
+    summaries, so every arm gets a point in every snapshot. A report without
+    a parsable ``generated_at_iso`` yields no rows.
+    """
+    ts_ms = _iso_to_epoch_ms(str(report.get("generated_at_iso", "")))
+    if ts_ms is None:
+        return []
+    rows: List[Dict[str, Any]] = []
+
+    def _add(kind: str, key: str, metric: str, value: Any) -> None:
+        rows.append(
+            {
+                "ts_epoch_ms": ts_ms,
+                "kind": kind,
+                "key": key,
+                "metric": metric,
+                "value": float(value or 0.0),
+            }
+        )
+
+    for arm_name in sorted(arms):
+        arm = arms[arm_name]
+        _add("arm", arm_name, "mean_reward", arm_mean(arm))
+        _add("arm", arm_name, "confidence", arm_confidence(arm))
+        _add("arm", arm_name, "pulls", int(arm.get("pulls", 0) or 0))
+        _add("arm", arm_name, "total_reward", float(arm.get("total_reward", 0.0) or 0.0))
+    for status, count in sorted((report.get("status_counts") or {}).items()):
+        _add("status", str(status), "count", count)
+    for method, bucket in sorted((report.get("method_friction") or {}).items()):
+        for metric, value in sorted(bucket.items()):
+            _add("method_friction", f"method:{method}", metric, value)
+    return rows
+
+
+def append_learning_snapshot(
+    history_dir: Path, report: Dict[str, Any], arms: Dict[str, Dict[str, Any]]
+) -> Optional[Path]:
+    """Write one snapshot file under ``<history_dir>/learning/month=YYYY-MM/``.
+
+    Raises RuntimeError when the report timestamp is unparsable, rather than
+    filing the snapshot under a guessed month.
+    """
+    pa, _, pq = _require_pyarrow()
+    generated_at = str(report.get("generated_at_iso", ""))
+    if _iso_to_epoch_ms(generated_at) is None:
+        raise RuntimeError(f"unparsable generated_at_iso {generated_at!r}")
+    rows = learning_snapshot_rows(report, arms)
+    if not rows:
+        return None
+    ts_ms = int(rows[0]["ts_epoch_ms"])
+    month = datetime.fromtimestamp(ts_ms / 1000.0, tz=timezone.utc).strftime("%Y-%m")
+    schema = pa.schema(
+        [
+            pa.field("ts_epoch_ms", pa.int64()),
+            pa.field("kind", pa.string()),
+            pa.field("key", pa.string()),
+            pa.field("metric", pa.string()),
+            pa.field("value", pa.float64()),
+        ]
+    )
+    table = pa.Table.from_pylist(rows, schema=schema)
+    out_dir = Path(history_dir) / _SNAPSHOT_DATASET / f"month={month}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / f"snapshot-{ts_ms}.parquet"
+    pq.write_table(table, out_path, compression="zstd")
+    return out_path
+
+
+def query_learning_trend(
+    history_dir: Path,
+    *,
+    key: str,
+    metric: str = "mean_reward",
+    kind: Optional[str] = None,
+    since_ms: Optional[int] = None,
+) -> List[Tuple[int, float]]:
+    """Return (ts_epoch_ms, value) points for one series, oldest first.
+
+    Month partitions older than ``since_ms`` are pruned before any file is
+    opened; the remaining files are scanned for two columns only.
+    """
+    _, ds, _ = _require_pyarrow()
+    root = Path(history_dir) / _SNAPSHOT_DATASET
+    if not root.exists():
+        return []
+    dataset = ds.dataset(str(root), format="parquet", partitioning="hive")
+    if kind is None:
+        kind = "arm" if key.startswith(("method:", "cat:")) else "status"
+    expr = (
+        (ds.field("kind") == kind)
+        & (ds.field("key") == key)
+        & (ds.field("metric") == metric)
+    )
+    if since_ms is not None:
+        since_month = datetime.fromtimestamp(since_ms / 1000.0, tz=timezone.utc)
+        expr = (
+            expr
+            & (ds.field("month") >= since_month.strftime("%Y-%m"))
+            & (ds.field("ts_epoch_ms") >= int(since_ms))
+        )
+    table = dataset.to_table(columns=["ts_epoch_ms", "value"], filter=expr)
+    points = zip(
+        table.column("ts_epoch_ms").to_pylist(),
+        table.column("value").to_pylist(),
+        strict=True,
+    )
+    return sorted((int(ts), float(v)) for ts, v in points)
+
@@ -1,16 +1,20 @@
 import hashlib
 import json
 import math
+import os
 import re
+import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
 
 
 _NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
 
 # ATS patterns ordered by specificity (most specific first)
-_ATS_PATTERNS: List[tuple] = [
+ATS_PATTERNS: List[tuple] = [
     ("mercor", re.compile(r"work\.mercor\.com")),
     ("ashby", re.compile(r"ashbyhq\.com")),
     ("greenhouse", re.compile(r"greenhouse\.io|job-boards\.greenhouse\.io")),
@@ -57,7 +61,7 @@ def normalize_status(status: str) -> str:
 def infer_application_method(url: str) -> str:
     """Infer ATS/application method from a job URL. Returns a stable lowercase key."""
     url = (url or "").lower()
-    for name, pattern in _ATS_PATTERNS:
+    for name, pattern in ATS_PATTERNS:
         if pattern.search(url):
             return name
     return "direct"
@@ -91,12 +95,64 @@ def _parse_iso_utc(ts: str) -> Optional[datetime]:
     return dt.astimezone(timezone.utc)
 
 
+def epoch_ms(ts: str) -> Optional[int]:
+    """ISO-8601 timestamp -> integer milliseconds since the Unix epoch (UTC)."""
+    dt = _parse_iso_utc(ts)
+    if dt is None:
+        return None
+    return int(dt.timestamp() * 1000)
+
+
+def row_epoch_ms(row: Dict[str, Any], *, ts_key: str = "ts") -> Optional[int]:
+    """Pre-parsed ``ts_epoch_ms`` when present, else parse ``row[ts_key]``."""
+    value = row.get("ts_epoch_ms")
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return epoch_ms(str(row.get(ts_key, "") or ""))
+
+
+def add_epoch_ms(
+    rows: Iterable[Dict[str, Any]], *, ts_key: str = "ts"
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Backfill ``ts_epoch_ms`` on rows that predate it. Returns (rows, changed)."""
+    out: List[Dict[str, Any]] = []
+    changed = 0
+    for row in rows:
+        if "ts_epoch_ms" not in row:
+            value = epoch_ms(str(row.get(ts_key, "") or ""))
+            if value is not None:
+                row = dict(row)
+                row["ts_epoch_ms"] = value
+                changed += 1
+        out.append(row)
+    return out, changed
+
+
 def append_jsonl(path: Path, payload: Dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("a", encoding="utf-8") as f:
         f.write(json.dumps(payload, ensure_ascii=True) + "\n")
 
 
+def write_jsonl_atomic(path: Path, rows: Iterable[Dict[str, Any]]) -> None:
+    """Rewrite a JSONL file via temp file + rename so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent)
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=True) + "\n")
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
 def load_jsonl(path: Path) -> List[Dict[str, Any]]:
     if not path.exists():
         return []
@@ -135,6 +191,7 @@ def build_short_memory_entry(
     return {
         "kind": "episodic",
         "ts": ts,
+        "ts_epoch_ms": epoch_ms(ts),
         "app_id": app_id,
         "event_type": event_type,
         "outcome": outcome,
@@ -167,6 +224,7 @@ def build_long_memory_entry(rec: Dict[str, Any], *, ts: str) -> Dict[str, Any]:
     return {
         "kind": "semantic",
         "ts": ts,
+        "ts_epoch_ms": epoch_ms(ts),
         "app_id": rec.get("app_id"),
         "company": rec.get("company"),
         "role": rec.get("role"),
@@ -178,26 +236,142 @@ def build_long_memory_entry(rec: Dict[str, Any], *, ts: str) -> Dict[str, Any]:
     }
 
 
+_LN2 = math.log(2.0)
+_MS_PER_DAY = 86_400_000.0
+
+
+def _decay_weight(
+    row: Dict[str, Any], *, now_ms: int, half_life_days: float
+) -> Optional[float]:
+    ts_ms = row_epoch_ms(row)
+    if ts_ms is None:
+        return None
+    age_days = max(0.0, (now_ms - ts_ms) / _MS_PER_DAY)
+    decay = math.exp(-_LN2 * age_days / max(0.1, half_life_days))
+    weight = float(row.get("score_hint", 0.35) or 0.35)
+    return max(0.0, min(1.0, decay * weight))
+
+
+def _now_ms(now_ts: str) -> int:
+    value = epoch_ms(now_ts)
+    if value is None:
+        value = int(datetime.now(timezone.utc).timestamp() * 1000)
+    return value
+
+
+def compact_short_memory(
+    rows: List[Dict[str, Any]],
+    *,
+    now_ts: str,
+    half_life_days: float = 14.0,
+    min_weight: float = 0.01,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Fold episodic rows whose decayed weight fell below ``min_weight``.
+
+    Outcome-bearing rows are always kept verbatim (feedback-batch ledgers key on
+    them). Low-weight rows with an app_id are folded into one
+    ``episodic_summary`` row per app; low-weight rows without an app_id carry no
+    retrieval signal and are dropped.
+    """
+    now_ms = _now_ms(now_ts)
+    kept: List[Dict[str, Any]] = []
+    folded: Dict[str, List[Dict[str, Any]]] = {}
+    dropped = 0
+
+    for row in rows:
+        if str(row.get("outcome", "") or "").strip():
+            kept.append(row)
+            continue
+        is_summary = row.get("kind") == "episodic_summary"
+        weight = _decay_weight(row, now_ms=now_ms, half_life_days=half_life_days)
+        if not is_summary and (weight is None or weight >= min_weight):
+            kept.append(row)
+            continue
+        app_id = str(row.get("app_id", "") or "")
+        if not app_id:
+            dropped += 1
+            continue
+        folded.setdefault(app_id, []).append(row)
+
+    summaries: List[Dict[str, Any]] = []
+    for app_id, group in folded.items():
+        if len(group) == 1 and group[0].get("kind") == "episodic_summary":
+            summaries.append(group[0])
+            continue
+        type_counts: Dict[str, int] = {}
+        count = 0
+        for row in group:
+            n = int(row.get("folded_count", 1) or 1)
+            count += n
+            if row.get("kind") == "episodic_summary":
+                for k, v in (row.get("event_types") or {}).items():
+                    type_counts[str(k)] = type_counts.get(str(k), 0) + int(v)
+            else:
+                key = str(row.get("event_type", "") or "unknown")
+                type_counts[key] = type_counts.get(key, 0) + 1
+        last_ts = max(str(r.get("ts", "") or "") for r in group)
+        stamps_ms = [v for v in (row_epoch_ms(r) for r in group) if v is not None]
+        first_ts = min(str(r.get("first_ts", r.get("ts", "")) or "") for r in group)
+        summaries.append(
+            {
+                "kind": "episodic_summary",
+                "ts": last_ts,
+                "ts_epoch_ms": max(stamps_ms) if stamps_ms else None,
+                "first_ts": first_ts,
+                "app_id": app_id,
+                "event_type": "compacted",
+                "outcome": None,
+                "score_hint": max(
+                    float(r.get("score_hint", 0.35) or 0.35) for r in group
+                ),
+                "folded_count": count,
+                "event_types": dict(sorted(type_counts.items())),
+                "text": "compacted "
+                + ", ".join(f"{k}={v}" for k, v in sorted(type_counts.items())),
+            }
+        )
+
+    summaries.sort(key=lambda r: (str(r.get("ts", "")), str(r.get("app_id", ""))))
+    stats = {
+        "input": len(rows),
+        "kept": len(kept),
+        "folded": sum(len(g) for g in folded.values()),
+        "summaries": len(summaries),
+        "dropped": dropped,
+    }
+    return summaries + kept, stats
+
+
 def recency_scores(
     rows: List[Dict[str, Any]], *, now_ts: str, half_life_days: float = 14.0
 ) -> Dict[str, float]:
-    now = _parse_iso_utc(now_ts) or datetime.now(timezone.utc)
-    by_app: Dict[str, float] = {}
+    now_ms = _now_ms(now_ts)
+    app_index: Dict[str, int] = {}
+    codes: List[int] = []
+    stamps: List[int] = []
+    weights: List[float] = []
 
     for row in rows:
         app_id = str(row.get("app_id", "") or "")
         if not app_id:
             continue
-        ts = _parse_iso_utc(str(row.get("ts", "") or ""))
-        if ts is None:
+        ts_ms = row_epoch_ms(row)
+        if ts_ms is None:
             continue
-        age_days = max(0.0, (now - ts).total_seconds() / 86400.0)
-        decay = math.exp(-math.log(2.0) * age_days / max(0.1, half_life_days))
-        weight = float(row.get("score_hint", 0.35) or 0.35)
-        score = max(0.0, min(1.0, decay * weight))
-        by_app[app_id] = max(by_app.get(app_id, 0.0), score)
-
-    return by_app
+        codes.append(app_index.setdefault(app_id, len(app_index)))
+        stamps.append(ts_ms)
+        weights.append(float(row.get("score_hint", 0.35) or 0.35))
+
+    if not codes:
+        return {}
+
+    ages = (now_ms - np.asarray(stamps, dtype=np.float64)) / _MS_PER_DAY
+    ages = np.maximum(0.0, ages)
+    decay = np.exp(-_LN2 * ages / max(0.1, half_life_days))
+    scores = np.clip(decay * np.asarray(weights, dtype=np.float64), 0.0, 1.0)
+    best = np.zeros(len(app_index), dtype=np.float64)
+    np.maximum.at(best, np.asarray(codes, dtype=np.intp), scores)
+    return {app_id: float(best[idx]) for app_id, idx in app_index.items()}
 
 
 def long_memory_scores(rows: List[Dict[str, Any]]) -> Dict[str, float]:
@@ -0,0 +1,389 @@
+"""Offline replay of submit-queue ranking policies.
+
+Rebuilds the decision history from labelled outcomes (``events.jsonl`` outcome
+events plus tracker-inferred outcomes) and replays the Thompson arm updates in
+time order, so every queue snapshot only sees arms learned on earlier days.
+Each snapshot's candidate features are stored once as flat numpy columns;
+any number of ``RankingPolicy`` weightings are then scored, ranked and
+compared against the whole history in a few array passes.
+
+An application's decision day is its tracker Date Applied when known (else
+its first outcome event); events only drive rewards and arm updates, so a
+snapshot never sees an outcome logged after the decision it replays.
+
+A queue snapshot is taken for every day with a decision. It holds every
+labelled application decided that day or within the next ``window_days - 1``
+days, i.e. the backlog the loop was choosing from. Notes flags (anti-bot,
+manual rescue) come from the current tracker because notes history is not
+recorded, so the two penalties are evaluated with hindsight.
+"""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import asdict, dataclass, fields
+from datetime import date
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from rlhf import OUTCOME_REWARDS
+
+_DAY_LEN = len("YYYY-MM-DD")
+
+
+@dataclass(frozen=True)
+class RankingPolicy:
+    """Weights of the ``learning_features_for_row`` score (defaults = production)."""
+
+    name: str = "production"
+    method_weight: float = 0.52
+    tag_weight: float = 0.40
+    evidence_step: float = 0.01
+    evidence_cap: float = 0.08
+    antibot_penalty: float = 0.04
+    manual_penalty: float = 0.03
+
+    def weights(self) -> Dict[str, float]:
+        return {k: v for k, v in asdict(self).items() if k != "name"}
+
+
+PRODUCTION_POLICY = RankingPolicy()
+POLICY_WEIGHTS = tuple(f.name for f in fields(RankingPolicy) if f.name != "name")
+
+
+def policy_grid(
+    values: Mapping[str, Sequence[float]], *, base: RankingPolicy = PRODUCTION_POLICY
+) -> List[RankingPolicy]:
+    """Cartesian product of weight values over ``base``; names list the overrides."""
+    unknown = sorted(set(values) - set(POLICY_WEIGHTS))
+    if unknown:
+        raise ValueError(f"Unknown policy weight(s): {', '.join(unknown)}")
+    keys = sorted(values)
+    policies: List[RankingPolicy] = []
+    for combo in itertools.product(*(values[k] for k in keys)):
+        overrides = {k: float(v) for k, v in zip(keys, combo, strict=True)}
+        name = ",".join(f"{k}={v:g}" for k, v in overrides.items()) or base.name
+        policies.append(RankingPolicy(name=name, **{**base.weights(), **overrides}))
+    return policies
+
+
+@dataclass
+class ReplayHistory:
+    """Flat candidate columns, one row per (queue snapshot, application).
+
+    Rows are grouped by snapshot (``starts`` marks each group) and keep
+    decision order inside a group.
+    """
+
+    group: np.ndarray
+    starts: np.ndarray
+    method_mean: np.ndarray
+    has_method: np.ndarray
+    tag_sum: np.ndarray
+    tag_n: np.ndarray
+    antibot: np.ndarray
+    manual: np.ndarray
+    lane_priority: np.ndarray
+    reward: np.ndarray
+    logged: np.ndarray
+    app_index: np.ndarray
+    app_ids: List[str]
+    days: List[str]
+
+    @property
+    def candidates(self) -> int:
+        return int(self.group.size)
+
+
+_COLUMNS = {
+    "group": np.int64,
+    "method_mean": np.float64,
+    "has_method": np.float64,
+    "tag_sum": np.float64,
+    "tag_n": np.float64,
+    "antibot": np.float64,
+    "manual": np.float64,
+    "lane_priority": np.int64,
+    "reward": np.float64,
+    "logged": bool,
+    "app_index": np.int64,
+}
+
+
+def _day(ts: str) -> int:
+    return date.fromisoformat(str(ts)[:_DAY_LEN]).toordinal()
+
+
+def _decision_day(app: Mapping[str, Any], first_event_day: int) -> int:
+    try:
+        return _day(app.get("decided_on") or "")
+    except ValueError:
+        return first_event_day
+
+
+def build_replay_history(
+    events: Sequence[Mapping[str, Any]],
+    apps: Mapping[str, Mapping[str, Any]],
+    *,
+    window_days: int = 7,
+    prior_arms: Optional[Mapping[str, Mapping[str, Any]]] = None,
+) -> ReplayHistory:
+    """Reconstruct queue snapshots from outcome ``events``.
+
+    ``events`` carry ``ts`` (ISO date or datetime), ``app_id`` and ``outcome``;
+    every event updates the arms of its app like ``ThompsonModel``. ``apps``
+    maps app_id to ``method``, ``tags``, ``antibot``, ``manual``,
+    ``lane_priority`` and ``decided_on`` (ISO day). An application is decided
+    on ``decided_on``, or at its first event when that is missing or invalid,
+    and rewarded by its last event. Events for unknown apps or outcomes are
+    ignored.
+    """
+    window_days = max(1, int(window_days))
+    usable = sorted(
+        (
+            (str(e["ts"]), str(e["app_id"]), str(e["outcome"]))
+            for e in events
+            if e.get("ts")
+            and e.get("app_id") in apps
+            and e.get("outcome") in OUTCOME_REWARDS
+        ),
+        key=lambda e: e[0],
+    )
+
+    first: Dict[str, int] = {}
+    final: Dict[str, str] = {}
+    for ts, app_id, outcome in usable:
+        first.setdefault(app_id, _day(ts))
+        final[app_id] = outcome
+    decided = {
+        app_id: _decision_day(apps[app_id], day) for app_id, day in first.items()
+    }
+    # By decision day; the stable sort keeps first-event order within a day.
+    app_ids = sorted(decided, key=decided.__getitem__)
+
+    # Arm table: prior arms first, then every arm any app can touch.
+    arm_ids: Dict[str, int] = {}
+    alpha: List[float] = []
+    beta: List[float] = []
+    known: List[bool] = []
+
+    def arm(name: str) -> int:
+        if name not in arm_ids:
+            arm_ids[name] = len(alpha)
+            alpha.append(1.0)
+            beta.append(1.0)
+            known.append(False)
+        return arm_ids[name]
+
+    for name, stats in (prior_arms or {}).items():
+        i = arm(name)
+        alpha[i] = float(stats.get("alpha", 1.0) or 1.0)
+        beta[i] = float(stats.get("beta", 1.0) or 1.0)
+        known[i] = True
+    app_arms = {
+        app_id: (
+            arm(f"method:{apps[app_id].get('method') or 'direct'}"),
+            [arm(f"cat:{tag}") for tag in apps[app_id].get("tags") or []],
+        )
+        for app_id in dict.fromkeys(a for _, a, _ in usable)
+    }
+    alpha_a = np.asarray(alpha, dtype=np.float64)
+    beta_a = np.asarray(beta, dtype=np.float64)
+    known_a = np.asarray(known, dtype=bool)
+
+    # Per-app columns in decision order; tags flattened with an owner index.
+    n_apps = len(app_ids)
+    day_of = np.asarray([decided[a] for a in app_ids], dtype=np.int64)
+    method_arm = np.asarray([app_arms[a][0] for a in app_ids], dtype=np.int64)
+    tag_lists = [app_arms[a][1] for a in app_ids]
+    tag_arm = np.asarray([t for tags in tag_lists for t in tags], dtype=np.int64)
+    tag_owner = np.repeat(np.arange(n_apps), [len(tags) for tags in tag_lists])
+    tag_off = np.concatenate([[0], np.cumsum([len(tags) for tags in tag_lists])]).astype(
+        np.int64
+    )
+    reward_of = np.asarray([OUTCOME_REWARDS[final[a]] for a in app_ids])
+    info = [apps[a] for a in app_ids]
+    antibot_of = np.asarray([bool(i.get("antibot")) for i in info], dtype=np.float64)
+    manual_of = np.asarray([bool(i.get("manual")) for i in info], dtype=np.float64)
+    lane_of = np.asarray([int(i.get("lane_priority", 1)) for i in info], dtype=np.int64)
+
+    # Event arm hits in time order, for batched Beta updates between snapshots.
+    ev_day = np.asarray([_day(ts) for ts, _, _ in usable], dtype=np.int64)
+    ev_reward = np.asarray([OUTCOME_REWARDS[o] for _, _, o in usable])
+    ev_arms = [[app_arms[a][0], *app_arms[a][1]] for _, a, _ in usable]
+    hit_arm = np.asarray([i for arms in ev_arms for i in arms], dtype=np.int64)
+    hit_event = np.repeat(np.arange(len(usable)), [len(arms) for arms in ev_arms])
+
+    columns: Dict[str, List[np.ndarray]] = {name: [] for name in _COLUMNS}
+    snapshot_days = np.unique(day_of)
+    applied = 0
+    for g, day in enumerate(snapshot_days.tolist()):
+        upto = int(np.searchsorted(ev_day, day, side="left"))
+        if upto > applied:
+            bounds = np.searchsorted(hit_event, [applied, upto], side="left")
+            sel = slice(*bounds.tolist())
+            r = ev_reward[hit_event[sel]]
+            np.add.at(alpha_a, hit_arm[sel], r)
+            np.add.at(beta_a, hit_arm[sel], 1.0 - r)
+            known_a[hit_arm[sel]] = True
+            applied = upto
+        lo = int(np.searchsorted(day_of, day, side="left"))
+        hi = int(np.searchsorted(day_of, day + window_days, side="left"))
+        mean = alpha_a / (alpha_a + beta_a)
+
+        m = method_arm[lo:hi]
+        t = tag_arm[tag_off[lo] : tag_off[hi]]
+        owner = tag_owner[tag_off[lo] : tag_off[hi]] - lo
+        t_known = known_a[t]
+        size = hi - lo
+        columns["group"].append(np.full(size, g, dtype=np.int64))
+        columns["method_mean"].append(np.where(known_a[m], mean[m], 0.5))
+        columns["has_method"].append(known_a[m].astype(np.float64))
+        columns["tag_sum"].append(
+            np.bincount(owner, weights=np.round(mean[t], 4) * t_known, minlength=size)
+        )
+        columns["tag_n"].append(np.bincount(owner, weights=t_known, minlength=size))
+        columns["antibot"].append(antibot_of[lo:hi])
+        columns["manual"].append(manual_of[lo:hi])
+        columns["lane_priority"].append(lane_of[lo:hi])
+        columns["reward"].append(reward_of[lo:hi])
+        columns["logged"].append(day_of[lo:hi] == day)
+        columns["app_index"].append(np.arange(lo, hi, dtype=np.int64))
+
+    flat = {
+        name: (np.concatenate(parts) if parts else np.zeros(0, dtype=_COLUMNS[name]))
+        for name, parts in columns.items()
+    }
+    sizes = np.bincount(flat["group"], minlength=len(snapshot_days))
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]) if sizes.size else sizes
+    return ReplayHistory(
+        starts=starts.astype(np.int64),
+        app_ids=app_ids,
+        days=[date.fromordinal(int(d)).isoformat() for d in snapshot_days],
+        **flat,
+    )
+
+
+def score_policies(
+    history: ReplayHistory, policies: Sequence[RankingPolicy]
+) -> np.ndarray:
+    """``adjusted_score`` of every candidate under every policy, shape (P, N)."""
+    w = {
+        name: np.asarray([getattr(p, name) for p in policies])[:, None]
+        for name in POLICY_WEIGHTS
+    }
+    h = history
+    tag_mean = np.where(h.tag_n > 0, h.tag_sum / np.maximum(h.tag_n, 1), 0.5)
+    scores = w["method_weight"] * h.method_mean
+    scores += w["tag_weight"] * tag_mean
+    evidence = h.has_method + h.tag_n
+    scores += np.minimum(w["evidence_cap"], w["evidence_step"] * evidence)
+    np.minimum(scores, 1.0, out=scores)
+    scores -= w["antibot_penalty"] * h.antibot
+    scores -= w["manual_penalty"] * h.manual
+    return np.maximum(scores, 0.0, out=scores)
+
+
+def rank_in_snapshot(history: ReplayHistory, scores: np.ndarray) -> np.ndarray:
+    """0-based queue position of each candidate per policy, shape (P, N).
+
+    Orders like the submit queue: lane priority, then score (rounded to 4
+    places), ties in decision order.
+    """
+    h = history
+    # One unique int64 sort key per candidate (snapshot, lane, score bucket,
+    # row), so the unstable and much faster default argsort is exact.
+    buckets = np.rint(scores * 1e4).astype(np.int64)
+    band = (h.group * 2 + h.lane_priority) * 10001 + 10000
+    key = (band - buckets) * max(1, h.candidates) + np.arange(h.candidates)
+    order = np.argsort(key, axis=1)
+    position = np.arange(h.candidates) - h.starts[h.group]
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.broadcast_to(position, order.shape), axis=1)
+    return ranks
+
+
+_CHUNK_CELLS = 1 << 22  # candidate x policy cells per scoring pass
+
+
+def _per_group(history: ReplayHistory, values: np.ndarray) -> np.ndarray:
+    if history.candidates == 0:
+        return np.zeros(values.shape[:-1] + (0,))
+    return np.add.reduceat(values, history.starts, axis=-1)
+
+
+def evaluate_policies(
+    history: ReplayHistory,
+    policies: Sequence[RankingPolicy],
+    *,
+    k: int = 5,
+    baseline: RankingPolicy = PRODUCTION_POLICY,
+) -> Dict[str, Any]:
+    """Replay ``policies`` over every snapshot and compare them with ``baseline``.
+
+    Per policy: mean reward of the top ``k`` picks, NDCG@k, lift over the
+    baseline's reward@k, Spearman rank correlation with the baseline order and
+    top-k overlap with the baseline picks (each averaged over snapshots).
+    """
+    k = max(1, int(k))
+    h = history
+    sizes = np.diff(np.append(h.starts, h.candidates)).astype(np.float64)
+    slots = np.maximum(np.minimum(sizes, k), 1)
+    discount = np.append(1.0 / np.log2(np.arange(k) + 2.0), 0.0)
+    position = np.arange(h.candidates) - h.starts[h.group]
+    ideal_reward = h.reward[np.lexsort((-h.reward, h.group))]
+    ideal = _per_group(h, discount[np.minimum(position, k)] * ideal_reward)
+    pairs = sizes * (sizes**2 - 1.0)
+    multi = sizes > 1
+
+    def mean(values: np.ndarray, empty: float = 0.0) -> np.ndarray:
+        if values.shape[-1]:
+            return values.mean(axis=-1)
+        return np.full(values.shape[0], empty)
+
+    def metrics(ranks: np.ndarray, base_ranks: np.ndarray) -> np.ndarray:
+        top = ranks < k
+        reward_at_k = _per_group(h, top * h.reward) / slots
+        gain = _per_group(h, discount[np.minimum(ranks, k)] * h.reward)
+        ndcg = np.where(ideal > 0, gain / np.where(ideal > 0, ideal, 1.0), 1.0)
+        diff = (ranks - base_ranks).astype(np.float64)
+        spearman = 1.0 - 6.0 * _per_group(h, diff**2)[:, multi] / pairs[multi]
+        overlap = _per_group(h, (top & (base_ranks < k)).astype(np.float64)) / slots
+        return np.stack(
+            [mean(reward_at_k), mean(ndcg), mean(spearman, 1.0), mean(overlap)], axis=1
+        )
+
+    # Policies are scored in chunks so the (policies, candidates) working set
+    # stays bounded on long histories and large grids.
+    all_policies = [baseline, *policies]
+    base_ranks = rank_in_snapshot(h, score_policies(h, all_policies[:1]))
+    step = max(1, _CHUNK_CELLS // max(1, h.candidates))
+    chunks = [all_policies[i : i + step] for i in range(0, len(all_policies), step)]
+    table = np.concatenate(
+        [metrics(rank_in_snapshot(h, score_policies(h, c)), base_ranks) for c in chunks]
+    )
+    reward_mean, ndcg_mean, spearman_mean, overlap_mean = table.T
+    logged_n = _per_group(h, h.logged.astype(np.float64))
+    logged = _per_group(h, h.logged * h.reward) / np.maximum(logged_n, 1)
+    results = [
+        {
+            "policy": policy.name,
+            **policy.weights(),
+            "reward_at_k": round(float(reward_mean[i]), 4),
+            "ndcg_at_k": round(float(ndcg_mean[i]), 4),
+            "lift_vs_baseline": round(float(reward_mean[i] - reward_mean[0]), 4),
+            "spearman_vs_baseline": round(float(spearman_mean[i]), 4),
+            "overlap_at_k_vs_baseline": round(float(overlap_mean[i]), 4),
+        }
+        for i, policy in enumerate(all_policies)
+    ]
+    return {
+        "k": k,
+        "snapshots": len(h.days),
+        "decisions": len(h.app_ids),
+        "candidates": h.candidates,
+        "logged_reward": round(float(mean(logged[None, :])[0]), 4),
+        "baseline": results[0],
+        "policies": results[1:],
+    }
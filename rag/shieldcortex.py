@@ -1,6 +1,11 @@
+import codecs
+import hashlib
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 @dataclass(frozen=True)
@@ -28,7 +33,7 @@ _DOB_CONTEXT_RE = re.compile(r"(?i)\b(dob|date of birth)\b")
 _DATE_RE = re.compile(r"\b(0[1-9]|1[0-2])/(0[1-9]|[12]\d|3[01])/(19\d{2}|20\d{2})\b")
 
 
-def scan_pii(text: str) -> List[Finding]:
+def _scan_pii_multipass(text: str) -> List[Finding]:
     findings: List[Finding] = []
 
     for m in _SSN_RE.finditer(text):
@@ -47,7 +52,7 @@ def scan_pii(text: str) -> List[Finding]:
     return findings
 
 
-def redact(text: str) -> str:
+def _redact_multipass(text: str) -> str:
     # Redact SSN always.
     text = _SSN_RE.sub("[REDACTED_SSN]", text)
     # Medium-risk PII is redacted and allowed through the gate.
@@ -70,13 +75,329 @@ def redact(text: str) -> str:
     return "".join(out)
 
 
-def assert_no_high_risk_pii(text: str, *, context: str = "") -> None:
-    findings = scan_pii(text)
-    if not findings:
-        return
-    kinds = ", ".join(sorted({f.kind for f in findings}))
+# Single-pass scanner: one alternation in the same priority order the multipass
+# redactor applies its substitutions (ssn, email, phone, then dates). Every
+# pattern opens with \b, so it is hoisted out and checked once per position.
+_COMBINED_RE = re.compile(
+    r"\b(?:"
+    + "|".join(
+        f"(?P<{kind}>{rx.pattern[2:]})"
+        for kind, rx in (
+            ("ssn", _SSN_RE),
+            ("email", _EMAIL_RE),
+            ("phone", _PHONE_RE),
+            ("date", _DATE_RE),
+        )
+    )
+    + ")"
+)
+_REPLACEMENTS = {
+    "ssn": "[REDACTED_SSN]",
+    "email": "[REDACTED_EMAIL]",
+    "phone": "[REDACTED_PHONE]",
+}
+_DOB_WINDOW = 40
+
+_Match = Tuple[str, int, int]
+
+
+def _scan_matches(text: str) -> Optional[List[_Match]]:
+    """Walk ``text`` once and return (kind, start, end) hits in order.
+
+    Returns None when two hits overlap or touch. Only then can the sequential
+    substitutions of the multipass redactor see different word boundaries than
+    a single pass does, so callers fall back to it for exact parity.
+    """
+    matches: List[_Match] = []
+    match_at = _COMBINED_RE.match
+    for m in _COMBINED_RE.finditer(text):
+        kind = m.lastgroup or ""
+        start, end = m.span()
+        for pos in range(start + 1, end + 1):
+            other = match_at(text, pos)
+            if other is not None and (pos == end or other.lastgroup != kind):
+                return None
+        matches.append((kind, start, end))
+    return matches
+
+
+def _has_dob_context(text: str, start: int, end: int) -> bool:
+    # Slice (not pos/endpos) so \b at the window edges behaves as before.
+    window = text[max(0, start - _DOB_WINDOW) : min(len(text), end + _DOB_WINDOW)]
+    return _DOB_CONTEXT_RE.search(window) is not None
+
+
+def _findings_from_matches(text: str, matches: List[_Match]) -> List[Finding]:
+    ssns: List[Finding] = []
+    dobs: List[Finding] = []
+    for kind, start, end in matches:
+        if kind == "ssn":
+            ssns.append(Finding("ssn", start, end, text[start:end]))
+        elif kind == "date" and _has_dob_context(text, start, end):
+            dobs.append(Finding("dob", start, end, text[start:end]))
+    return ssns + dobs
+
+
+def _redact_from_matches(text: str, matches: List[_Match]) -> str:
+    if not matches:
+        return text
+    # Substitute ssn/email/phone while tracking where each date lands in the
+    # substituted text; the DOB window is evaluated there, as before.
+    parts: List[str] = []
+    dates: List[Tuple[int, int]] = []
+    last = 0
+    cursor = 0
+    for kind, start, end in matches:
+        gap = text[last:start]
+        parts.append(gap)
+        cursor += len(gap)
+        if kind == "date":
+            dates.append((cursor, cursor + end - start))
+            parts.append(text[start:end])
+            cursor += end - start
+        else:
+            rep = _REPLACEMENTS[kind]
+            parts.append(rep)
+            cursor += len(rep)
+        last = end
+    parts.append(text[last:])
+    substituted = "".join(parts)
+    if not dates:
+        return substituted
+
+    out: List[str] = []
+    last = 0
+    for start, end in dates:
+        if _has_dob_context(substituted, start, end):
+            out.append(substituted[last:start])
+            out.append("[REDACTED_DOB]")
+            last = end
+    out.append(substituted[last:])
+    return "".join(out)
+
+
+def scan_pii(text: str) -> List[Finding]:
+    matches = _scan_matches(text)
+    if matches is None:
+        return _scan_pii_multipass(text)
+    return _findings_from_matches(text, matches)
+
+
+def redact(text: str) -> str:
+    matches = _scan_matches(text)
+    if matches is None:
+        return _redact_multipass(text)
+    return _redact_from_matches(text, matches)
+
+
+# ---------------------------------------------------------------------------
+# Streaming scan (constant memory, absolute offsets)
+# ---------------------------------------------------------------------------
+
+# Longest SSN/date match is 11 chars; a match is only final once its trailing
+# \b char and the 40-char DOB window after it are buffered.
+_STREAM_HOLD = 11 + 1 + _DOB_WINDOW
+# Chars kept before the resume point: the DOB window before a date plus the
+# char \b inspects at the resume position.
+_STREAM_LEFT = _DOB_WINDOW + 1
+_STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def scan_pii_stream(chunks: Iterable[str]) -> Iterator[Finding]:
+    """Stream ``scan_pii`` over text chunks, yielding findings by position.
+
+    Finds exactly what ``scan_pii`` would on ``"".join(chunks)`` (offsets are
+    absolute) while buffering only one chunk plus a small overlap.
+    """
+    buf = ""
+    base = 0  # absolute offset of buf[0]
+    ssn_pos = 0  # absolute resume positions, one per pattern (as in finditer)
+    date_pos = 0
+    chunk_iter = iter(chunks)
+    done = False
+    while not done:
+        chunk = next(chunk_iter, None)
+        if chunk is None:
+            done = True
+        elif not chunk:
+            continue
+        else:
+            buf += chunk
+        limit = len(buf) if done else len(buf) - _STREAM_HOLD
+        if limit <= 0 and not done:
+            continue
+
+        found: List[Finding] = []
+        next_ssn = max(ssn_pos - base, limit)
+        for m in _SSN_RE.finditer(buf, ssn_pos - base):
+            if m.start() >= limit:
+                break
+            found.append(Finding("ssn", base + m.start(), base + m.end(), m.group()))
+            next_ssn = max(m.end(), limit)
+        next_date = max(date_pos - base, limit)
+        for m in _DATE_RE.finditer(buf, date_pos - base):
+            if m.start() >= limit:
+                break
+            if _has_dob_context(buf, m.start(), m.end()):
+                found.append(Finding("dob", base + m.start(), base + m.end(), m.group()))
+            next_date = max(m.end(), limit)
+        ssn_pos, date_pos = base + next_ssn, base + next_date
+        found.sort(key=lambda f: f.start)
+        yield from found
+
+        cut = min(next_ssn, next_date) - _STREAM_LEFT
+        if cut > 0:
+            buf = buf[cut:]
+            base += cut
+
+
+def iter_text_chunks(path: Path, *, chunk_bytes: int = _STREAM_CHUNK_BYTES) -> Iterator[str]:
+    """Decode a file incrementally (utf-8, errors=replace) in fixed-size reads."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with Path(path).open("rb") as f:
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                break
+            text = decoder.decode(data)
+            if text:
+                yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def assert_no_high_risk_pii_chunks(chunks: Iterable[str], *, context: str = "") -> None:
+    """``assert_no_high_risk_pii`` over streamed text chunks."""
+    kinds = tuple(sorted({f.kind for f in scan_pii_stream(chunks)}))
+    if kinds:
+        _raise_high_risk(kinds, context)
+
+
+def assert_no_high_risk_pii_file(path: Path, *, context: str = "") -> None:
+    """``assert_no_high_risk_pii`` over a whole file of any size, streamed."""
+    assert_no_high_risk_pii_chunks(iter_text_chunks(path), context=context)
+
+
+# ---------------------------------------------------------------------------
+# Gate memo: bounded LRU keyed by a content digest
+# ---------------------------------------------------------------------------
+
+_MEMO_MAX_ENTRIES = 4096
+_MEMO_MAX_BYTES = 64 * 1024 * 1024
+_UNCHANGED = object()  # redaction left the text as-is; reuse the caller's string
+
+
+class _GateMemo:
+    """LRU of gate outcomes per distinct text.
+
+    Values are (kinds, redacted): ``kinds`` is the sorted tuple of high-risk
+    finding kinds (non-empty means block), ``redacted`` is the redacted text,
+    ``_UNCHANGED``, or None when only the scan has run so far.
+    """
+
+    def __init__(self, *, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries: "OrderedDict[Tuple[bytes, int], List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str) -> Tuple[bytes, int]:
+        raw = text.encode("utf-8", "surrogatepass")
+        return hashlib.blake2b(raw, digest_size=16).digest(), len(raw)
+
+    @staticmethod
+    def _size(entry: List[Any]) -> int:
+        redacted = entry[1]
+        return len(redacted) if isinstance(redacted, str) else 0
+
+    def get(self, key: Tuple[bytes, int]) -> Optional[List[Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return list(entry)
+
+    def put(self, key: Tuple[bytes, int], kinds: Tuple[str, ...], redacted: Any) -> None:
+        entry = [kinds, redacted]
+        if self._size(entry) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= self._size(old)
+            self._entries[key] = entry
+            self._bytes += self._size(entry)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._size(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+_GATE_MEMO = _GateMemo(max_entries=_MEMO_MAX_ENTRIES, max_bytes=_MEMO_MAX_BYTES)
+
+
+def gate_memo_stats() -> Dict[str, Any]:
+    """Process-wide gate memo counters (hits, misses, hit_rate, entries, bytes)."""
+    return _GATE_MEMO.stats()
+
+
+def reset_gate_memo() -> None:
+    _GATE_MEMO.clear()
+
+
+def _raise_high_risk(kinds: Tuple[str, ...], context: str) -> None:
     where = f" ({context})" if context else ""
-    raise ValueError(f"High-risk PII detected: {kinds}{where}; refusing to ingest/log.")
+    raise ValueError(
+        f"High-risk PII detected: {', '.join(kinds)}{where}; refusing to ingest/log."
+    )
+
+
+def _scan_kinds(text: str) -> Tuple[Optional[List[_Match]], Tuple[str, ...]]:
+    matches = _scan_matches(text)
+    if matches is None:
+        findings = _scan_pii_multipass(text)
+    else:
+        findings = _findings_from_matches(text, matches)
+    return matches, tuple(sorted({f.kind for f in findings}))
+
+
+def assert_no_high_risk_pii(text: str, *, context: str = "") -> None:
+    key = _GATE_MEMO.key(text)
+    entry = _GATE_MEMO.get(key)
+    if entry is None:
+        _, kinds = _scan_kinds(text)
+        _GATE_MEMO.put(key, kinds, None)
+    else:
+        kinds = entry[0]
+    if kinds:
+        _raise_high_risk(kinds, context)
 
 
 def gate_text(text: str, *, context: str = "") -> GateResult:
@@ -86,17 +407,33 @@ def gate_text(text: str, *, context: str = "") -> GateResult:
     - allow:      no high-risk findings
     - quarantine: redaction changed text (currently informational)
     - block:      high-risk PII detected (ssn/dob)
+
+    Outcomes are memoized per distinct text, so repeated artifacts skip the
+    regex work; a memoized block re-raises with the caller's context.
     """
-    findings = scan_pii(text)
-    if findings:
-        kinds = ", ".join(sorted({f.kind for f in findings}))
-        where = f" ({context})" if context else ""
-        raise ValueError(
-            f"High-risk PII detected: {kinds}{where}; refusing to ingest/log."
-        )
+    key = _GATE_MEMO.key(text)
+    entry = _GATE_MEMO.get(key)
+    matches: Optional[List[_Match]] = None
+    if entry is None:
+        matches, kinds = _scan_kinds(text)
+        redacted: Any = None
+    else:
+        kinds, redacted = entry
+    if kinds:
+        if entry is None:
+            _GATE_MEMO.put(key, kinds, None)
+        _raise_high_risk(kinds, context)
+
+    if redacted is None:
+        if entry is not None:
+            matches = _scan_matches(text)
+        if matches is None:
+            out = _redact_multipass(text)
+        else:
+            out = _redact_from_matches(text, matches)
+        redacted = _UNCHANGED if out == text else out
+        _GATE_MEMO.put(key, kinds, redacted)
 
-    redacted = redact(text)
-    action = "allow"
-    if redacted != text:
-        action = "quarantine"
-    return GateResult(action=action, text=redacted, findings=[])
+    if redacted is _UNCHANGED:
+        return GateResult(action="allow", text=text, findings=[])
+    return GateResult(action="quarantine", text=redacted, findings=[])
@@ -2,11 +2,14 @@
 
 import json
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Protocol
 
 from contracts import (
     build_retrieve_envelope,
     build_retrieve_request,
+    build_retrieve_request_v2,
+    decode_retrieve_cursor,
+    iter_retrieve_ndjson,
     validate_retrieve_payload,
 )
 
@@ -15,7 +18,14 @@ class StructuredAdapter(Protocol):
     name: str
 
     def normalize_retrieve_request(
-        self, *, query: str, k: int, status: Optional[str], method: Optional[str]
+        self,
+        *,
+        query: str,
+        k: int,
+        status: Optional[str],
+        method: Optional[str],
+        since: Optional[str] = None,
+        until: Optional[str] = None,
     ) -> Dict[str, Any]: ...
 
     def validate_retrieve_results(
@@ -30,6 +40,32 @@ class StructuredAdapter(Protocol):
         envelope: bool,
     ) -> str: ...
 
+    def normalize_retrieve_request_v2(
+        self,
+        *,
+        query: str,
+        k: int,
+        status: Optional[str],
+        method: Optional[str],
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]: ...
+
+    def retrieve_offset(
+        self, request: Dict[str, Any], *, index_version: str
+    ) -> int: ...
+
+    def iter_retrieve_ndjson(
+        self,
+        *,
+        request: Dict[str, Any],
+        results: Iterable[Dict[str, Any]],
+        index_version: str,
+        offset: int,
+        total: int,
+    ) -> Iterator[str]: ...
+
 
 @dataclass(frozen=True)
 class LocalStructuredAdapter:
@@ -38,9 +74,18 @@ class LocalStructuredAdapter:
     name: str = "local_fusion_v1"
 
     def normalize_retrieve_request(
-        self, *, query: str, k: int, status: Optional[str], method: Optional[str]
+        self,
+        *,
+        query: str,
+        k: int,
+        status: Optional[str],
+        method: Optional[str],
+        since: Optional[str] = None,
+        until: Optional[str] = None,
     ) -> Dict[str, Any]:
-        return build_retrieve_request(query=query, k=k, status=status, method=method)
+        return build_retrieve_request(
+            query=query, k=k, status=status, method=method, since=since, until=until
+        )
 
     def validate_retrieve_results(
         self, results: List[Dict[str, Any]]
@@ -63,6 +108,53 @@ class LocalStructuredAdapter:
             payload = validated
         return json.dumps(payload, ensure_ascii=True, indent=2)
 
+    def normalize_retrieve_request_v2(
+        self,
+        *,
+        query: str,
+        k: int,
+        status: Optional[str],
+        method: Optional[str],
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return build_retrieve_request_v2(
+            query=query,
+            k=k,
+            status=status,
+            method=method,
+            since=since,
+            until=until,
+            cursor=cursor,
+        )
+
+    def retrieve_offset(self, request: Dict[str, Any], *, index_version: str) -> int:
+        cursor = request.get("cursor")
+        if not cursor:
+            return 0
+        return decode_retrieve_cursor(
+            cursor, request=request, index_version=index_version
+        )
+
+    def iter_retrieve_ndjson(
+        self,
+        *,
+        request: Dict[str, Any],
+        results: Iterable[Dict[str, Any]],
+        index_version: str,
+        offset: int,
+        total: int,
+    ) -> Iterator[str]:
+        return iter_retrieve_ndjson(
+            request=request,
+            results=results,
+            provider=self.name,
+            index_version=index_version,
+            offset=offset,
+            total=total,
+        )
+
 
 def get_structured_adapter(provider: str = "local") -> StructuredAdapter:
     key = (provider or "local").strip().lower()
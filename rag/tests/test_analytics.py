@@ -0,0 +1,80 @@
+"""Tests for analytics.py — Arrow group-by over applications.jsonl."""
+
+import json
+from datetime import date
+
+import pytest
+
+from analytics import aggregate_applications, filter_applications, load_applications_table
+
+
+def _rec(app_id, status, method, tags, date_applied="", **tracker):
+    return {
+        "app_id": app_id,
+        "company": app_id.upper(),
+        "status": status,
+        "date_applied": date_applied,
+        "application_method": method,
+        "tags": tags,
+        "rag_text": "large text that analytics never reads",
+        "source_tracker_row": {"Notes": "x", **tracker},
+    }
+
+
+@pytest.fixture
+def apps_jsonl(tmp_path):
+    rows = [
+        _rec("a", "Applied", "ashby", ["ai", "remote"], "2026-03-01", Response="Recruiter reached out"),
+        _rec("b", "Applied", "ashby", ["ai"], "2026-03-10"),
+        _rec("c", "Applied", "greenhouse", ["infra"], "2026-01-05", **{"Interview Stage": "Phone screen"}),
+        _rec("d", "Rejected", "lever", ["ai"], "2026-03-02"),
+        _rec("e", "Blocked", "ashby", [], "2026-03-03", Response="Submit blocked, reply later"),
+        _rec("f", "Draft", "direct", ["remote"]),
+    ]
+    path = tmp_path / "applications.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    return path
+
+
+class TestLoad:
+    def test_slim_columns_and_responded_flag(self, apps_jsonl):
+        table = load_applications_table(apps_jsonl)
+        assert "rag_text" not in table.column_names
+        flags = dict(
+            zip(table["app_id"].to_pylist(), table["responded"].to_pylist(), strict=True)
+        )
+        assert flags == {"a": True, "b": False, "c": True, "d": True, "e": False, "f": False}
+        assert table["date_applied"].to_pylist()[-1] is None
+
+    def test_missing_file_gives_empty_table(self, tmp_path):
+        table = load_applications_table(tmp_path / "nope.jsonl")
+        assert table.num_rows == 0
+        assert aggregate_applications(table, ["method"]) == []
+
+
+class TestAggregate:
+    def test_group_by_method(self, apps_jsonl):
+        rows = aggregate_applications(load_applications_table(apps_jsonl), ["method"])
+        ashby = next(r for r in rows if r["method"] == "ashby")
+        assert (ashby["count"], ashby["applied"], ashby["responded"]) == (3, 2, 1)
+        assert ashby["response_rate"] == pytest.approx(0.3333)
+        assert rows[0]["method"] == "ashby"  # sorted by count desc
+
+    def test_group_by_method_and_tag_explodes_tags(self, apps_jsonl):
+        rows = aggregate_applications(load_applications_table(apps_jsonl), ["method", "tag"])
+        keyed = {(r["method"], r["tag"]): r["count"] for r in rows}
+        assert keyed[("ashby", "ai")] == 2
+        assert keyed[("ashby", "remote")] == 1
+        assert ("ashby", None) not in keyed  # untagged rows drop out of tag groups
+
+    def test_date_window_and_status_filter(self, apps_jsonl):
+        table = load_applications_table(apps_jsonl)
+        recent = filter_applications(table, days=30, today=date(2026, 3, 20))
+        assert sorted(recent["app_id"].to_pylist()) == ["a", "b", "d", "e"]
+        applied = filter_applications(recent, status="Applied", method="ASHBY")
+        rows = aggregate_applications(applied, [])
+        assert rows == [{"count": 2, "applied": 2, "responded": 1, "response_rate": 0.5}]
+
+    def test_unknown_key_raises(self, apps_jsonl):
+        with pytest.raises(ValueError, match="unknown group key"):
+            aggregate_applications(load_applications_table(apps_jsonl), ["salary"])
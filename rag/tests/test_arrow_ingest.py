@@ -0,0 +1,116 @@
+"""Tests for arrow_ingest.py — parity with memalign.normalize_row."""
+
+import csv
+
+import numpy as np
+from arrow_ingest import (
+    first_occurrence,
+    normalize_tracker_table,
+    read_tracker_table,
+    vectors_from_matrix,
+)
+from memalign import normalize_row
+
+FIELDS = ["Company", "Role", "Status", "Tags", "Career Page URL", "Notes"]
+ROWS = [
+    {
+        "Company": "Acme AI",
+        "Role": "Senior ML Engineer",
+        "Status": " applied ",
+        "Tags": "ai; remote;; python ",
+        "Career Page URL": "https://jobs.ashbyhq.com/acme/1",
+        "Notes": "line one\nline two",
+    },
+    {
+        "Company": "",
+        "Role": "",
+        "Status": "",
+        "Tags": "",
+        "Career Page URL": "",
+        "Notes": "",
+    },
+    {
+        "Company": "D-Wave Quantum!",
+        "Role": "SRE II",
+        "Status": "In Progress",
+        "Tags": "",
+        "Career Page URL": "https://dwave.wd5.myworkdayjobs.com/job/2",
+        "Notes": "",
+    },
+    {
+        "Company": "Beta Corp",
+        "Role": "Platform Engineer",
+        "Status": "Paused",
+        "Tags": ";",
+        "Career Page URL": "https://beta.com/careers/3",
+        "Notes": "",
+    },
+    {
+        "Company": "Acme AI",
+        "Role": "Senior ML Engineer",
+        "Status": "Rejected",
+        "Tags": "ai",
+        "Career Page URL": "https://jobs.ashbyhq.com/acme/1",
+        "Notes": "",
+    },
+]
+
+
+def _write(path, rows):
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=FIELDS)
+        w.writeheader()
+        w.writerows(rows)
+    return path
+
+
+def _expected(path):
+    with path.open("r", newline="", encoding="utf-8") as f:
+        rows = [r for r in csv.DictReader(f) if any((v or "").strip() for v in r.values())]
+    return [normalize_row(r) for r in rows]
+
+
+class TestNormalize:
+    def test_matches_normalize_row(self, tmp_path):
+        path = _write(tmp_path / "tracker.csv", ROWS)
+        got = normalize_tracker_table(read_tracker_table(path)).to_pylist()
+        expected = _expected(path)
+        assert len(got) == len(expected) == 4
+        for e, g in zip(expected, got, strict=True):
+            for key in ("Status", "Tags", "app_id", "application_method", "Notes"):
+                assert g[key] == e[key], key
+
+    def test_status_and_method_values(self, tmp_path):
+        path = _write(tmp_path / "tracker.csv", ROWS)
+        got = normalize_tracker_table(read_tracker_table(path)).to_pylist()
+        assert [g["Status"] for g in got] == ["Applied", "Draft", "Paused", "Rejected"]
+        assert [g["application_method"] for g in got] == [
+            "ashby",
+            "workday",
+            "direct",
+            "ashby",
+        ]
+        assert got[0]["Tags"] == ["ai", "remote", "python"]
+        assert got[2]["Tags"] == []
+
+    def test_header_only(self, tmp_path):
+        path = _write(tmp_path / "tracker.csv", [])
+        assert normalize_tracker_table(read_tracker_table(path)).num_rows == 0
+
+
+class TestFirstOccurrence:
+    def test_keeps_first_row_per_app_id_in_order(self, tmp_path):
+        path = _write(tmp_path / "tracker.csv", ROWS)
+        table = first_occurrence(normalize_tracker_table(read_tracker_table(path)))
+        rows = table.to_pylist()
+        assert [r["Company"] for r in rows] == ["Acme AI", "D-Wave Quantum!", "Beta Corp"]
+        assert rows[0]["Status"] == "Applied"
+
+
+class TestVectors:
+    def test_fixed_size_list_from_matrix(self):
+        matrix = np.arange(12, dtype=np.float32).reshape(3, 4)
+        arr = vectors_from_matrix(matrix)
+        assert arr.type.list_size == 4
+        assert len(arr) == 3
+        assert arr[1].as_py() == [4.0, 5.0, 6.0, 7.0]
@@ -449,6 +449,23 @@ def test_queue_only_demotes_ready_row_when_fit_drops(tmp_path, monkeypatch):
     assert payload["queue_demoted_count"] == 1
 
 
+def test_docx_from_html_keeps_visible_text_lines(tmp_path):
+    mod = _load_module()
+    resume = tmp_path / "resume.html"
+    resume.write_text(
+        "<html><head><style>p{margin:0}</style><script>var a = 1;</script></head>"
+        "<body><h1>Jane   Doe</h1><p>Staff&nbsp;Engineer<br>Remote</p>"
+        "<ul><li>Kubernetes</li><li>Go &amp; Python</li></ul></body></html>",
+        encoding="utf-8",
+    )
+    docx = mod._create_docx_from_html(resume)
+    with zipfile.ZipFile(docx) as zf:
+        document = zf.read("word/document.xml").decode("utf-8")
+    paragraphs = re.findall(r"<w:t[^>]*>(.*?)</w:t>", document)
+    # <br>, </p> and </li> break lines; script/style bodies are dropped.
+    assert paragraphs == ["Jane Doe Staff Engineer", "Remote", "Kubernetes", "Go &amp; Python"]
+
+
 def test_queue_only_autogenerates_docx_from_html(tmp_path, monkeypatch):
     mod = _load_module()
     monkeypatch.setattr(mod, "ROOT", tmp_path)
@@ -155,6 +155,470 @@ class TestBuild:
         assert len(long_rows) >= 1
 
 
+    def test_records_carry_epoch_timestamp(self, isolated_cli):
+        isolated_cli.build()
+        apps_path = isolated_cli.DATA_DIR / "applications.jsonl"
+        rec = json.loads(apps_path.read_text().splitlines()[0])
+        assert isinstance(rec["ts_epoch_ms"], int)
+        events = (isolated_cli.LOG_DIR / "events.jsonl").read_text().splitlines()
+        assert all(isinstance(json.loads(e)["ts_epoch_ms"], int) for e in events)
+
+    def test_arrow_ingest_matches_row_ingest(self, isolated_cli):
+        apps_path = isolated_cli.DATA_DIR / "applications.jsonl"
+        volatile = ("updated_at", "ts_epoch_ms")
+
+        def load():
+            rows = [json.loads(line) for line in apps_path.read_text().splitlines()]
+            return [{k: v for k, v in r.items() if k not in volatile} for r in rows]
+
+        isolated_cli.build(ingest="rows")
+        by_rows = load()
+        isolated_cli.build(ingest="arrow")
+        assert load() == by_rows
+        table = isolated_cli._lancedb_connect(str(isolated_cli.LANCEDB_DIR)).open_table(
+            "applications"
+        )
+        assert table.count_rows() == len(by_rows)
+
+    def test_migrate_timestamps_backfills_legacy_rows(self, isolated_cli):
+        legacy = {"kind": "episodic", "ts": "2026-02-19T00:00:00+00:00", "app_id": "a"}
+        isolated_cli.SHORT_MEMORY_JSONL.parent.mkdir(parents=True, exist_ok=True)
+        isolated_cli.SHORT_MEMORY_JSONL.write_text(json.dumps(legacy) + "\n")
+
+        changed = isolated_cli.migrate_timestamps()
+        assert changed["memory_short.jsonl"] == 1
+        row = json.loads(isolated_cli.SHORT_MEMORY_JSONL.read_text())
+        assert row["ts_epoch_ms"] == 1771459200000
+        assert isolated_cli.migrate_timestamps()["memory_short.jsonl"] == 0
+
+
+class _FakeDist:
+    """In-process stand-in for torch.distributed.gather_object."""
+
+    def __init__(self, rank, sent):
+        self.rank = rank
+        self.sent = sent
+
+    def gather_object(self, payload, gathered, dst=0):
+        self.sent[self.rank] = payload
+        if gathered is not None:
+            for r in range(len(gathered)):
+                gathered[r] = self.sent.get(r)
+
+
+class TestDistributedBuild:
+    def test_ipc_round_trip_keeps_records(self, isolated_cli, tmp_path):
+        isolated_cli.build()
+        records = [
+            json.loads(line)
+            for line in (isolated_cli.DATA_DIR / "applications.jsonl").read_text().splitlines()
+        ]
+        path = tmp_path / "part.arrow"
+        assert isolated_cli._write_records_ipc(records, path) == len(records)
+        back = list(isolated_cli._read_records_ipc(path))
+        assert back == records
+        assert [list(r) for r in back] == [list(r) for r in records]
+        assert isolated_cli._write_records_ipc([], path) == 0
+        assert list(isolated_cli._read_records_ipc(path)) == []
+
+    def test_ipc_rejects_fields_outside_the_schema(self, isolated_cli, tmp_path):
+        path = tmp_path / "spool" / "part.arrow"
+        with pytest.raises(ValueError, match="extra_field"):
+            isolated_cli._write_records_ipc([{"app_id": "a", "extra_field": 1}], path)
+        assert not path.parent.exists()
+
+    def test_leader_removes_spool_files_when_a_part_fails(
+        self, isolated_cli, tmp_path, monkeypatch
+    ):
+        from distributed import DistRuntime
+
+        def broken(path):
+            raise OSError(f"cannot read {path.name}")
+            yield  # pragma: no cover
+
+        monkeypatch.setattr(isolated_cli, "_read_records_ipc", broken)
+        sent = {}
+        spool = tmp_path / "spool"
+        for rank in (1, 0):
+            runtime = DistRuntime(
+                enabled=True,
+                mode="on",
+                backend="fake",
+                rank=rank,
+                world_size=2,
+                _dist=_FakeDist(rank, sent),
+            )
+            if rank == 1:
+                assert isolated_cli._gather_records_via_ipc(
+                    runtime, [], [], spool_dir=spool
+                ) is None
+                assert len(list(spool.iterdir())) == 2
+                continue
+            with pytest.raises(OSError, match="cannot read"):
+                isolated_cli._gather_records_via_ipc(runtime, [], [], spool_dir=spool)
+        assert list(spool.iterdir()) == []
+
+    def test_ranks_hand_off_records_through_spool_files(
+        self, isolated_cli, tmp_path, monkeypatch
+    ):
+        from distributed import DistRuntime
+
+        apps_path = isolated_cli.DATA_DIR / "applications.jsonl"
+        volatile = ("updated_at", "ts_epoch_ms")
+
+        def load():
+            rows = [json.loads(line) for line in apps_path.read_text().splitlines()]
+            return sorted(
+                ({k: v for k, v in r.items() if k not in volatile} for r in rows),
+                key=lambda r: r["app_id"],
+            )
+
+        jobs = isolated_cli.APPLICATIONS_DIR / "acme-ai" / "jobs"
+        jobs.mkdir(parents=True)
+        (jobs / "posting.md").write_text("Posting: train ranking models", encoding="utf-8")
+
+        isolated_cli.build(dist_mode="off")
+        expected = load()
+        store_path = isolated_cli.DATA_DIR / "artifacts.jsonl"
+        expected_store = store_path.read_text()
+        assert "train ranking models" in expected_store
+        apps_path.unlink()
+        store_path.unlink()
+
+        sent = {}
+        spool = tmp_path / "spool"
+        for rank in (1, 0):
+            runtime = DistRuntime(
+                enabled=True,
+                mode="on",
+                backend="fake",
+                rank=rank,
+                world_size=2,
+                _dist=_FakeDist(rank, sent),
+            )
+            monkeypatch.setattr(
+                isolated_cli, "create_runtime", lambda runtime=runtime, **_: runtime
+            )
+            isolated_cli.build(spool_dir=str(spool))
+            if rank == 1:
+                assert not apps_path.exists()
+
+        assert load() == expected
+        assert store_path.read_text() == expected_store
+        keys = {"path", "artifacts_path", "rows", "errors", "seconds", "plan"}
+        assert all(set(p) == keys for p in sent.values())
+        assert sum(p["rows"] for p in sent.values()) == len(expected)
+        assert list(spool.iterdir()) == []
+
+        events = [
+            json.loads(line)
+            for line in (isolated_cli.LOG_DIR / "events.jsonl").read_text().splitlines()
+        ]
+        profile = [e for e in events if e["type"] == "build_profile"]
+        assert len(profile) == 1
+        assert "est_skew=" in profile[0]["msg"] and "wall_skew=" in profile[0]["msg"]
+
+    def test_leader_rejects_diverging_shard_plans(
+        self, isolated_cli, tmp_path, monkeypatch
+    ):
+        from distributed import DistRuntime
+
+        real = isolated_cli._plan_build_shards
+        sent = {}
+        apps_path = isolated_cli.DATA_DIR / "applications.jsonl"
+        for rank in (1, 0):
+            runtime = DistRuntime(
+                enabled=True,
+                mode="on",
+                backend="fake",
+                rank=rank,
+                world_size=2,
+                _dist=_FakeDist(rank, sent),
+            )
+            monkeypatch.setattr(
+                isolated_cli, "create_runtime", lambda runtime=runtime, **_: runtime
+            )
+            # Rank 1 sees one tracker row fewer, as if the file changed mid-build.
+            rows_seen = (lambda rows: rows[:-1]) if rank == 1 else (lambda rows: rows)
+            monkeypatch.setattr(
+                isolated_cli,
+                "_plan_build_shards",
+                lambda rows, n, seen=rows_seen: real(seen(rows), n),
+            )
+            if rank == 1:
+                isolated_cli.build(spool_dir=str(tmp_path / "spool"))
+                continue
+            with pytest.raises(SystemExit, match="disagree on the shard plan"):
+                isolated_cli.build(spool_dir=str(tmp_path / "spool"))
+        assert not apps_path.exists()
+        assert list((tmp_path / "spool").iterdir()) == []
+
+    def test_shard_plan_keeps_companies_together(self, isolated_cli):
+        from memalign import normalize_row
+
+        rows = isolated_cli._load_tracker_rows()
+        extra = dict(rows[0], Role="Staff ML Engineer", **{"Career Page URL": "https://x/2"})
+        rows = rows + [extra]
+        plan, summary = isolated_cli._plan_build_shards(rows, 2)
+
+        by_company = {}
+        for row in rows:
+            n = normalize_row(row)
+            by_company.setdefault(n["Company"], set()).add(plan[n["app_id"]])
+        assert all(len(ranks) == 1 for ranks in by_company.values())
+        assert sum(summary["rows"]) == len(plan) == len(rows)
+        assert sum(summary["companies"]) == len(by_company)
+        assert plan == isolated_cli._plan_build_shards(rows, 2)[0]
+
+        owned = [
+            isolated_cli._build_records_from_rows(
+                rows, shard_rank=r, shard_world_size=2, shard_plan=plan
+            )[0]
+            for r in range(2)
+        ]
+        assert sorted(len(o) for o in owned) == sorted(summary["rows"])
+
+
+class TestGateMemoReport:
+    def test_build_reports_gate_memo_hits(self, isolated_cli, capsys):
+        import shieldcortex
+
+        shieldcortex.reset_gate_memo()
+        isolated_cli.build()
+        isolated_cli.build()
+        out = capsys.readouterr().out
+        assert "gate memo:" in out
+        assert shieldcortex.gate_memo_stats()["hits"] > 0
+
+
+class TestScan:
+    SSN = "123-45-" + "6789"
+
+    def _write(self, root, rel, text):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_scan_finds_pii_and_prunes_heavy_dirs(self, isolated_cli, capsys):
+        root = isolated_cli.ROOT
+        self._write(root, "applications/acme/notes.md", f"ssn {self.SSN}")
+        self._write(root, "applications/acme/clean.txt", "nothing here")
+        self._write(root, ".git/COMMIT_EDITMSG.txt", f"ssn {self.SSN}")
+        self._write(root, "node_modules/pkg/readme.md", f"ssn {self.SSN}")
+        self._write(root, ".ci_submit_chrome_profile/Default/x.txt", f"ssn {self.SSN}")
+        self._write(root, "rag/lancedb/t.txt", f"ssn {self.SSN}")
+
+        findings = isolated_cli.scan()
+        assert [rel for rel, _ in findings] == ["applications/acme/notes.md"]
+        assert "ssn" in findings[0][1]
+
+    def test_scan_checks_docx_text(self, isolated_cli):
+        import zipfile
+
+        path = isolated_cli.ROOT / "applications" / "acme" / "resume.docx"
+        path.parent.mkdir(parents=True)
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr(
+                "word/document.xml",
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f"<w:body><w:p><w:r><w:t>SSN {self.SSN}</w:t></w:r></w:p></w:body></w:document>",
+            )
+        findings = isolated_cli.scan(use_manifest=False)
+        assert [rel for rel, _ in findings] == ["applications/acme/resume.docx"]
+
+    def test_scan_fails_closed_on_unreadable_docx(self, isolated_cli, capsys):
+        self._write(isolated_cli.ROOT, "applications/acme/broken.docx", "not a zip")
+        for _ in range(2):
+            findings = isolated_cli.scan()
+            assert [rel for rel, _ in findings] == ["applications/acme/broken.docx"]
+            assert findings[0][1].startswith("unreadable: BadZipFile")
+        # Not cached: the second scan reads it again (tracker CSV is cached).
+        assert "scanned 1 of 2 files" in capsys.readouterr().out
+
+    def test_scan_streams_files_larger_than_read_cap(self, isolated_cli):
+        big = "filler line\n" * 30_000 + f"ssn {self.SSN}\n"
+        self._write(isolated_cli.ROOT, "applications/acme/huge_log.txt", big)
+        findings = isolated_cli.scan(use_manifest=False)
+        assert [rel for rel, _ in findings] == ["applications/acme/huge_log.txt"]
+
+    def test_build_rejects_artifact_with_pii_past_read_cap(self, isolated_cli):
+        ssn = "123-45-" + "6789"
+        big = "filler line\n" * 30_000 + f"ssn {ssn}\n"
+        artifact = isolated_cli.APPLICATIONS_DIR / "acme-ai" / "notes.md"
+        artifact.parent.mkdir(parents=True)
+        artifact.write_text(big, encoding="utf-8")
+        isolated_cli.build()
+        ids = [
+            json.loads(line)["company"]
+            for line in (isolated_cli.DATA_DIR / "applications.jsonl").read_text().splitlines()
+        ]
+        assert "Acme AI" not in ids
+        events = (isolated_cli.LOG_DIR / "events.jsonl").read_text(encoding="utf-8")
+        assert "ingest_error" in events
+
+    def test_manifest_skips_unchanged_files(self, isolated_cli, capsys):
+        root = isolated_cli.ROOT
+        self._write(root, "applications/acme/a.md", "fine")
+        dirty = self._write(root, "applications/acme/b.md", f"ssn {self.SSN}")
+        assert len(isolated_cli.scan()) == 1
+        capsys.readouterr()
+
+        assert len(isolated_cli.scan()) == 1  # cached finding is still reported
+        assert "scanned 0 of 3 files" in capsys.readouterr().out  # + tracker CSV
+
+        dirty.write_text("cleaned up", encoding="utf-8")
+        assert isolated_cli.scan() == []
+        assert "scanned 1 of 3 files" in capsys.readouterr().out
+
+    def test_scanner_version_invalidates_manifest(self, isolated_cli, capsys, monkeypatch):
+        self._write(isolated_cli.ROOT, "applications/acme/a.md", "fine")
+        isolated_cli.scan()
+        capsys.readouterr()
+        monkeypatch.setattr(isolated_cli, "_SCANNER_VERSION", isolated_cli._SCANNER_VERSION + 1)
+        isolated_cli.scan()
+        assert "scanned 2 of 2 files" in capsys.readouterr().out
+
+    def test_process_pool_matches_serial(self, isolated_cli, monkeypatch):
+        root = isolated_cli.ROOT
+        for i in range(6):
+            body = f"ssn {self.SSN}" if i % 2 else "clean"
+            self._write(root, f"applications/c{i}/notes.md", body)
+        serial = isolated_cli.scan(jobs=1, use_manifest=False)
+        monkeypatch.setattr(isolated_cli, "_SCAN_POOL_MIN_FILES", 1)
+        pooled = isolated_cli.scan(jobs=2, use_manifest=False)
+        assert pooled == serial
+        assert len(pooled) == 3
+
+    def test_gate_memo_reported_only_for_serial_scan(self, isolated_cli, capsys, monkeypatch):
+        for i in range(2):
+            self._write(isolated_cli.ROOT, f"applications/c{i}/notes.md", f"note {i}")
+        isolated_cli.scan(jobs=1, use_manifest=False)
+        assert "gate memo:" in capsys.readouterr().out
+        monkeypatch.setattr(isolated_cli, "_SCAN_POOL_MIN_FILES", 1)
+        isolated_cli.scan(jobs=2, use_manifest=False)
+        assert "gate memo:" not in capsys.readouterr().out
+
+    def test_changed_since_limits_to_git_changes(self, isolated_cli, capsys):
+        import subprocess
+
+        root = isolated_cli.ROOT
+        self._write(root, "applications/old.md", f"ssn {self.SSN}")
+        git = ["git", "-c", "user.email=t@example.com", "-c", "user.name=t"]
+        subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+        subprocess.run(git + ["add", "-A"], cwd=root, check=True)
+        subprocess.run(git + ["commit", "-qm", "init"], cwd=root, check=True)
+        self._write(root, "applications/new.md", "fresh, clean")
+
+        assert isolated_cli.scan(changed_since="HEAD") == []
+        assert "scanned 1 of 1 files" in capsys.readouterr().out
+
+
+class TestDocxIngestion:
+    def test_build_indexes_docx_resume_text(self, isolated_cli):
+        import zipfile
+
+        resume = isolated_cli.APPLICATIONS_DIR / "acme-ai" / "tailored_resumes" / "r.docx"
+        resume.parent.mkdir(parents=True)
+        with zipfile.ZipFile(resume, "w") as zf:
+            zf.writestr(
+                "word/document.xml",
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                "<w:body><w:p><w:r><w:t>Kubernetes operator work</w:t></w:r></w:p>"
+                "<w:p><w:r><w:t>Reach me: jane@example.com</w:t></w:r></w:p></w:body></w:document>",
+            )
+        isolated_cli.build()
+        recs = [
+            json.loads(line)
+            for line in (isolated_cli.DATA_DIR / "applications.jsonl").read_text().splitlines()
+        ]
+        acme = next(r for r in recs if r["company"] == "Acme AI")
+        assert "FILE: applications/acme-ai/tailored_resumes/r.docx" in acme["rag_text"]
+        assert "Kubernetes operator work" in acme["rag_text"]
+        assert "jane@example.com" not in acme["rag_text"]
+
+
+class TestHtmlIngestion:
+    def test_build_indexes_html_as_text(self, isolated_cli):
+        app_dir = isolated_cli.APPLICATIONS_DIR / "acme-ai"
+        (app_dir / "jobs").mkdir(parents=True)
+        (app_dir / "resume.html").write_text(
+            '<html><style>.x{}</style><body><div class="hero">Platform &amp; ML</div></body></html>',
+            encoding="utf-8",
+        )
+        (app_dir / "jobs" / "posting.md").write_text(
+            "# Posting\n<section data-id=\"9\"><p>Build agents</p></section>\n",
+            encoding="utf-8",
+        )
+        isolated_cli.build()
+        recs = [
+            json.loads(line)
+            for line in (isolated_cli.DATA_DIR / "applications.jsonl").read_text().splitlines()
+        ]
+        text = next(r for r in recs if r["company"] == "Acme AI")["rag_text"]
+        assert "Platform & ML" in text
+        assert "# Posting\nBuild agents" in text
+        assert "<div" not in text and "class=" not in text and ".x{}" not in text
+        assert list((isolated_cli.RAG_DIR / ".cache" / "html_text").rglob("*.txt"))
+
+
+class TestArtifactStore:
+    def test_artifacts_stored_once_and_rows_keep_their_role(self, isolated_cli):
+        app_dir = isolated_cli.APPLICATIONS_DIR / "acme-ai"
+        (app_dir / "jobs").mkdir(parents=True)
+        (app_dir / "cover_letters").mkdir()
+        (app_dir / "jobs" / "2026-03-01_acme-ai_senior-ml-engineer.md").write_text(
+            "Posting: train ranking models", encoding="utf-8"
+        )
+        (app_dir / "jobs" / "2026-03-02_acme-ai_data-analyst.md").write_text(
+            "Posting: dashboards in SQL", encoding="utf-8"
+        )
+        letter = "Dear Acme, I build ML systems."
+        (app_dir / "cover_letters" / "2026-03-01_acme-ai_senior-ml-engineer.md").write_text(
+            letter, encoding="utf-8"
+        )
+        (app_dir / "cover_letters" / "copy.md").write_text(letter, encoding="utf-8")
+
+        isolated_cli.build()
+        recs = [
+            json.loads(line)
+            for line in (isolated_cli.DATA_DIR / "applications.jsonl").read_text().splitlines()
+        ]
+        acme = next(r for r in recs if r["company"] == "Acme AI")
+        assert "train ranking models" in acme["rag_text"]
+        assert "dashboards in SQL" not in acme["rag_text"]
+        assert acme["rag_text"].count(letter) == 1
+        assert len(acme["artifact_ids"]) == 3
+        assert len(acme["role_artifact_ids"]) == 2
+
+        store = [
+            json.loads(line)
+            for line in (isolated_cli.DATA_DIR / "artifacts.jsonl").read_text().splitlines()
+        ]
+        assert sorted(d["artifact_id"] for d in store) == sorted(acme["artifact_ids"])
+        shared = next(d for d in store if d["text"] == letter)
+        assert shared["kind"] == "cover_letters"
+        assert shared["aliases"] == ["applications/acme-ai/cover_letters/copy.md"]
+
+    def test_artifact_docs_gathered_once_per_company(self, isolated_cli, monkeypatch):
+        calls = []
+        real = isolated_cli._company_artifact_docs
+
+        def counting(company, artifacts):
+            calls.append(company)
+            return real(company, artifacts)
+
+        monkeypatch.setattr(isolated_cli, "_company_artifact_docs", counting)
+        rows = isolated_cli._load_tracker_rows()
+        extra = dict(rows[0], Role="Staff ML Engineer", **{"Career Page URL": "https://x/2"})
+        with isolated_cli.TRACKER_CSV.open("a", newline="", encoding="utf-8") as fh:
+            csv.DictWriter(fh, fieldnames=list(rows[0])).writerow(extra)
+
+        isolated_cli.build()
+        assert sorted(calls) == sorted({r["Company"] for r in rows})
+        assert (isolated_cli.DATA_DIR / "artifacts.jsonl").exists()
+
+
 class TestStatus:
     def test_shows_counts(self, isolated_cli, capsys):
         isolated_cli.build()
@@ -175,6 +639,184 @@ class TestStatus:
         out = capsys.readouterr().out
         assert "build" in out.lower()
 
+    def test_renders_from_materialized_summary(self, isolated_cli, capsys):
+        isolated_cli.build()
+        path = isolated_cli.DATA_DIR / "status_summary.json"
+        summary = json.loads(path.read_text())
+        assert summary["total"] == 3
+        assert [d["company"] for d in summary["drafts"]] == ["Beta Corp"]
+
+        summary["counts"]["Offer"] = 7
+        path.write_text(json.dumps(summary))
+        isolated_cli.status()
+        assert "Offer        7" in capsys.readouterr().out
+
+        isolated_cli.status(fresh=True)
+        assert "Offer        0" in capsys.readouterr().out
+        assert json.loads(path.read_text())["counts"].get("Offer") is None
+
+    def test_stale_summary_is_recomputed(self, isolated_cli, capsys):
+        import os
+
+        isolated_cli.build()
+        path = isolated_cli.DATA_DIR / "status_summary.json"
+        path.write_text(json.dumps({"version": 1, "total": 99, "counts": {}}))
+        hot = isolated_cli.DATA_DIR / "applications_hot.jsonl"
+        st = path.stat()
+        os.utime(hot, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        isolated_cli.status()
+        assert "Total: 3 applications" in capsys.readouterr().out
+
+
+class TestLanceDbMaintenance:
+    def test_retention_age_keeps_newest_versions_or_young_ones(self, isolated_cli):
+        from datetime import datetime, timedelta
+
+        now = datetime(2026, 5, 1, 12, 0, 0)
+        versions = [{"timestamp": now - timedelta(hours=h)} for h in range(6)]
+        age = isolated_cli._lancedb_retention_age(
+            versions, keep_versions=2, keep_age=timedelta(0), now=now
+        )
+        assert age == timedelta(hours=1, minutes=30)
+        age = isolated_cli._lancedb_retention_age(
+            versions, keep_versions=2, keep_age=timedelta(hours=3), now=now
+        )
+        assert age == timedelta(hours=3)
+        age = isolated_cli._lancedb_retention_age(
+            versions[:2], keep_versions=2, keep_age=timedelta(0), now=now
+        )
+        assert age > timedelta(days=365)
+
+    def test_maintenance_prunes_old_versions(self, isolated_cli, capsys):
+        if isolated_cli.lancedb is None:
+            pytest.skip("lancedb not installed")
+        for _ in range(3):
+            isolated_cli.build()
+        capsys.readouterr()
+
+        stats = isolated_cli.maintenance(keep_versions=2, keep_minutes=0, json_output=True)
+        assert stats["versions_after"] <= 3 < stats["versions_before"]
+        assert stats["reclaimed_bytes"] > 0
+        assert json.loads(capsys.readouterr().out)["reclaimed_bytes"] > 0
+        db = isolated_cli.lancedb.connect(str(isolated_cli.LANCEDB_DIR))
+        assert db.open_table("applications").count_rows() == 3
+
+
+class TestShardedIndex:
+    @staticmethod
+    def _write_tracker(path):
+        companies = ["Acme AI", "Beta Corp", "Gamma Infra", "Delta Labs", "Echo Cloud"]
+        roles = ["ML Engineer", "Platform Engineer", "React Native Developer"]
+        with path.open("w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=list(SAMPLE_ROWS[0].keys()))
+            w.writeheader()
+            for i in range(15):
+                row = dict(SAMPLE_ROWS[i % 3])
+                row["Company"] = companies[i % 5]
+                row["Role"] = roles[i % 3]
+                row["Date Applied"] = f"2026-0{2 + i % 3}-1{i % 10}" if i % 4 else ""
+                row["Career Page URL"] = f"https://jobs.ashbyhq.com/c{i}/{i}"
+                w.writerow(row)
+        return path
+
+    def test_build_writes_shard_manifest_and_cleans_up(self, isolated_cli):
+        if isolated_cli.lancedb is None:
+            pytest.skip("lancedb not installed")
+        isolated_cli.build(shards=3)
+        manifest = json.loads((isolated_cli.LANCEDB_DIR / "shards.json").read_text())
+        assert manifest["count"] == 3
+        assert sum(s["rows"] for s in manifest["shards"]) == 3
+        assert len(isolated_cli._lancedb_dirs()) == 3
+        assert not (isolated_cli.LANCEDB_DIR / "applications.lance").exists()
+
+        isolated_cli.build(shards=2)
+        shard_dirs = (isolated_cli.LANCEDB_DIR / "shards").iterdir()
+        assert sorted(p.name for p in shard_dirs) == ["00", "01"]
+        rows = isolated_cli.analyze(source="lancedb", json_output=True)
+        assert sum(r["count"] for r in rows) == 3
+
+        isolated_cli.build()
+        assert isolated_cli._lancedb_dirs() == [isolated_cli.LANCEDB_DIR]
+        assert not (isolated_cli.LANCEDB_DIR / "shards").exists()
+
+    def test_merged_results_match_unsharded_index(self, isolated_cli, tmp_path):
+        if isolated_cli.lancedb is None:
+            pytest.skip("lancedb not installed")
+        isolated_cli.TRACKER_CSV = self._write_tracker(tmp_path / "tracker15.csv")
+        queries = ["ml engineer", "react native mobile", "kubernetes infra remote", "acme"]
+        dated = isolated_cli._date_range("2026-03", None)
+
+        def run(shards):
+            isolated_cli.build(shards=shards)
+            out = []
+            for q in queries:
+                for date_range in (None, dated):
+                    rows = isolated_cli._hybrid_candidates(
+                        q, candidate_k=6, date_range=date_range
+                    )
+                    out.append([(r["app_id"], r["_hybrid_score"]) for r in rows])
+            return out
+
+        unsharded = run(0)
+        assert all(unsharded)
+        assert run(1) == unsharded
+        assert run(3) == unsharded
+        assert run(7) == unsharded
+
+    def test_lexical_leg_prefers_stronger_matches(self, isolated_cli):
+        def match(app_id, dl, **tf):
+            return {"app_id": app_id, "_tf": tf, "_dl": dl}
+
+        matches = [
+            match("a-weak", 40, kotlin=1),
+            match("z-strong", 6, android=1, kotlin=2),
+            match("m-none", 10),
+        ]
+        rows = isolated_cli._bm25_lexical_rows(
+            "android kotlin", matches, total_rows=20, candidate_k=5
+        )
+        assert [r["app_id"] for r in rows] == ["z-strong", "a-weak"]
+        assert "_tf" not in rows[0] and rows[0]["_score"] > rows[1]["_score"] > 0
+
+
+class TestHotIndex:
+    def test_build_writes_slim_hot_file(self, isolated_cli):
+        isolated_cli.build()
+        hot = [
+            json.loads(line)
+            for line in (isolated_cli.DATA_DIR / "applications_hot.jsonl").read_text().splitlines()
+        ]
+        assert len(hot) == 3
+        for rec in hot:
+            assert set(rec) <= set(isolated_cli._HOT_FIELDS)
+            assert {"app_id", "company", "status", "tags"} <= set(rec)
+
+    def test_readers_use_hot_file(self, isolated_cli, capsys):
+        isolated_cli.build()
+        full = isolated_cli.DATA_DIR / "applications.jsonl"
+        app_id = json.loads(full.read_text().splitlines()[0])["app_id"]
+        full.unlink()
+
+        isolated_cli.status()
+        assert "Total: 3 applications" in capsys.readouterr().out
+        isolated_cli.feedback(app_id, "response")
+        assert app_id in isolated_cli._load_app_lookup()
+
+    def test_falls_back_to_full_records_when_hot_file_is_stale(self, isolated_cli):
+        import os
+
+        isolated_cli.build()
+        hot = isolated_cli.DATA_DIR / "applications_hot.jsonl"
+        full = isolated_cli.DATA_DIR / "applications.jsonl"
+        hot.write_text("", encoding="utf-8")
+        st = full.stat()
+        os.utime(hot, ns=(st.st_atime_ns, st.st_mtime_ns - 1_000_000))
+
+        lookup = isolated_cli._load_app_lookup()
+        assert len(lookup) == 3
+        assert all("rag_text" not in rec for rec in lookup.values())
+
 
 class TestQuery:
     def test_query_falls_back_to_jsonl_when_lancedb_unavailable(
@@ -293,6 +935,125 @@ class TestQuery:
         with pytest.raises(SystemExit, match="requires --json"):
             isolated_cli.retrieve("ml engineer", envelope=True)
 
+    def test_date_range_bounds(self, isolated_cli):
+        assert isolated_cli._date_range(None, " ") is None
+        assert isolated_cli._date_range("2026-02", "2026-02") == (
+            "2026-02-01",
+            "2026-03-01",
+        )
+        assert isolated_cli._date_range("2026-02-10", "2026-12-31") == (
+            "2026-02-10",
+            "2027-01-01",
+        )
+        lo, hi = isolated_cli._date_range(None, "2026-02-09")
+        assert not isolated_cli._in_date_range("", (lo, hi))
+        assert not isolated_cli._in_date_range("ci_auto:ashby", (lo, "9999-12-32"))
+        with pytest.raises(ValueError, match="--since"):
+            isolated_cli._date_range("2026-13", None)
+        with pytest.raises(ValueError, match="after --until"):
+            isolated_cli._date_range("2026-03", "2026-02-28")
+
+    @pytest.mark.parametrize("use_lancedb", [True, False])
+    def test_retrieve_since_until_prefilter(
+        self, isolated_cli, capsys, monkeypatch, use_lancedb
+    ):
+        isolated_cli.build()
+        if not use_lancedb:
+            monkeypatch.setattr(isolated_cli, "lancedb", None)
+        capsys.readouterr()
+
+        isolated_cli.retrieve(
+            "engineer", k=5, since="2026-02-05", until="2026-02", json_output=True
+        )
+        payload = json.loads(capsys.readouterr().out)
+        assert [r["company"] for r in payload] == ["Gamma Infra"]
+
+        isolated_cli.query("engineer", k=5, until="2026-02-09")
+        out = capsys.readouterr().out
+        assert "Acme AI" in out
+        assert "Gamma Infra" not in out and "Beta Corp" not in out
+
+    def test_retrieve_rejects_bad_date(self, isolated_cli):
+        with pytest.raises(SystemExit, match="since must be"):
+            isolated_cli.retrieve("ml engineer", since="Feb 2026")
+
+    def test_retrieve_ndjson_pages_with_cursor(self, isolated_cli, capsys, monkeypatch):
+        from contracts import iter_retrieve_ndjson_items
+
+        isolated_cli.build()
+        capsys.readouterr()
+        isolated_cli.retrieve("engineer", k=5, json_output=True)
+        expected = [r["app_id"] for r in json.loads(capsys.readouterr().out)]
+
+        isolated_cli.retrieve("engineer", k=2, ndjson=True)
+        lines = capsys.readouterr().out.splitlines()
+        first = list(iter_retrieve_ndjson_items(lines))
+        header, end = json.loads(lines[0]), json.loads(lines[-1])
+        assert header["contract"] == "rag.retrieve.v2"
+        assert len(first) == 2 and end["total"] == len(expected) == 3
+        assert end["next_cursor"]
+
+        # Later pages come from the stored ranking, not a new search.
+        monkeypatch.setattr(isolated_cli, "_hybrid_candidates", None)
+        isolated_cli.retrieve("engineer", k=2, ndjson=True, cursor=end["next_cursor"])
+        lines = capsys.readouterr().out.splitlines()
+        second = list(iter_retrieve_ndjson_items(lines))
+        assert [r["app_id"] for r in first + second] == expected
+        assert [r["rank"] for r in first + second] == [0, 1, 2]
+        assert json.loads(lines[-1])["next_cursor"] is None
+
+    def test_retrieve_cursor_rejected_after_rebuild(self, isolated_cli, capsys):
+        isolated_cli.build()
+        isolated_cli.retrieve("engineer", k=1, ndjson=True)
+        cursor = json.loads(capsys.readouterr().out.splitlines()[-1])["next_cursor"]
+        with pytest.raises(SystemExit, match="does not match"):
+            isolated_cli.retrieve("ml", k=1, ndjson=True, cursor=cursor)
+        (isolated_cli.DATA_DIR / "applications.jsonl").write_text("", encoding="utf-8")
+        with pytest.raises(SystemExit, match="stale"):
+            isolated_cli.retrieve("engineer", k=1, ndjson=True, cursor=cursor)
+
+    def test_retrieve_first_page_reranks_and_feedback_stales_cursor(
+        self, isolated_cli, capsys, monkeypatch
+    ):
+        isolated_cli.build()
+        isolated_cli.retrieve("engineer", k=1, ndjson=True)
+        capsys.readouterr()
+
+        calls = []
+        real = isolated_cli._hybrid_candidates
+
+        def counting(*args, **kwargs):
+            calls.append(args)
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(isolated_cli, "_hybrid_candidates", counting)
+        isolated_cli.retrieve("engineer", k=1, ndjson=True)
+        cursor = json.loads(capsys.readouterr().out.splitlines()[-1])["next_cursor"]
+        assert len(calls) == 1
+
+        with isolated_cli.SHORT_MEMORY_JSONL.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"ts": "2026-10-18T00:00:00Z", "app_id": "x"}) + "\n")
+        with pytest.raises(SystemExit, match="stale"):
+            isolated_cli.retrieve("engineer", k=1, ndjson=True, cursor=cursor)
+
+    def test_retrieve_pages_directory_is_bounded(self, isolated_cli, capsys, monkeypatch):
+        monkeypatch.setattr(isolated_cli, "_RETRIEVE_PAGES_KEEP", 2)
+        isolated_cli.build()
+        pages = isolated_cli.DATA_DIR / "retrieve_pages"
+        for q in ("engineer", "ml", "infra"):
+            isolated_cli.retrieve(q, k=1, ndjson=True)
+        capsys.readouterr()
+        adapter = isolated_cli.get_structured_adapter("local")
+        request = adapter.normalize_retrieve_request_v2(
+            query="infra", k=1, status=None, method=None
+        )
+        latest = isolated_cli._retrieve_ranking_path(request, isolated_cli._index_version())
+        assert len(list(pages.glob("*.jsonl"))) == 2 and latest.exists()
+
+    def test_retrieve_cursor_requires_ndjson(self, isolated_cli):
+        with pytest.raises(SystemExit, match="requires --ndjson"):
+            isolated_cli.retrieve("ml engineer", cursor="abc")
+
 
 class TestLogEvent:
     def test_appends_to_events_jsonl(self, isolated_cli):
@@ -496,6 +1257,39 @@ class TestFeedbackBatch:
         assert pulls_second == pulls_first
 
 
+    def test_feedback_batch_compacts_short_memory(self, isolated_cli):
+        isolated_cli.build()
+        app_id = self._get_app_id(isolated_cli)
+        isolated_cli.feedback(app_id, "response")
+        with isolated_cli.SHORT_MEMORY_JSONL.open("a", encoding="utf-8") as f:
+            for _ in range(3):
+                f.write(
+                    json.dumps(
+                        {
+                            "kind": "episodic",
+                            "ts": "2025-01-01T00:00:00+00:00",
+                            "app_id": app_id,
+                            "event_type": "note",
+                            "outcome": None,
+                            "score_hint": 0.35,
+                            "text": "old note",
+                        }
+                    )
+                    + "\n"
+                )
+
+        isolated_cli.feedback_batch(source="memory_short", dist_mode="off")
+        rows = [
+            json.loads(line)
+            for line in isolated_cli.SHORT_MEMORY_JSONL.read_text().splitlines()
+            if line.strip()
+        ]
+        assert not any(r.get("text") == "old note" for r in rows)
+        summaries = [r for r in rows if r.get("kind") == "episodic_summary"]
+        assert summaries and summaries[0]["folded_count"] == 3
+        assert any(r.get("outcome") == "response" for r in rows)
+
+
 class TestTrackerSync:
     def test_sync_tracker_feedback_idempotent(self, isolated_cli, tmp_path):
         row = SAMPLE_ROWS[0].copy()
@@ -546,6 +1340,74 @@ class TestRecommend:
         assert "build" in out.lower() or "no" in out.lower()
 
 
+class TestAnalyze:
+    def test_analyze_by_method_json(self, isolated_cli, capsys):
+        isolated_cli.build()
+        capsys.readouterr()
+        rows = isolated_cli.analyze(by=["method"], json_output=True)
+        payload = json.loads(capsys.readouterr().out)
+        assert payload == rows
+        counts = {r["method"]: r["count"] for r in rows}
+        assert counts == {"ashby": 2, "lever": 1}
+
+    def test_analyze_table_output(self, isolated_cli, capsys):
+        isolated_cli.build()
+        capsys.readouterr()
+        isolated_cli.analyze(by=["tag"], status="Applied")
+        out = capsys.readouterr().out
+        assert "Analyze by tag" in out
+        assert "remote" in out
+
+
+class TestTrend:
+    def test_trend_reads_history_snapshots(self, isolated_cli, capsys):
+        from learning import append_learning_snapshot, build_learning_report
+
+        isolated_cli.build()
+        model_arms = json.loads(isolated_cli.ARMS_JSON.read_text(encoding="utf-8"))
+        report = build_learning_report(isolated_cli._load_tracker_rows(), model_arms)
+        append_learning_snapshot(isolated_cli.DATA_DIR / "history", report, model_arms)
+        capsys.readouterr()
+
+        points = isolated_cli.trend("method:ashby", json_output=True)
+        payload = json.loads(capsys.readouterr().out)
+        assert len(points) == 1
+        assert payload["key"] == "method:ashby"
+        assert payload["points"][0]["value"] == pytest.approx(points[0][1])
+
+    def test_trend_without_history_prints_hint(self, isolated_cli, capsys):
+        assert isolated_cli.trend("method:ashby") == []
+        assert "No snapshots" in capsys.readouterr().out
+
+
+class TestReplay:
+    def test_replay_uses_events_and_inferred_outcomes(self, isolated_cli, capsys):
+        from memalign import normalize_row
+
+        acme = normalize_row(isolated_cli._load_tracker_rows()[0])["app_id"]
+        isolated_cli.LOG_DIR.mkdir(parents=True, exist_ok=True)
+        event = {
+            "ts": "2026-02-12T09:00:00+00:00",
+            "type": "outcome",
+            "app_id": acme,
+            "msg": "outcome=interview method=ashby tags=['ai']",
+        }
+        (isolated_cli.LOG_DIR / "events.jsonl").write_text(json.dumps(event) + "\n")
+
+        report = isolated_cli.replay(vary=["antibot_penalty=0,0.1"], json_output=True)
+        payload = json.loads(capsys.readouterr().out)
+        assert payload["decisions"] == report["decisions"] == 2
+        assert payload["snapshots"] == 2
+        assert [p["policy"] for p in payload["policies"]] == [
+            "antibot_penalty=0",
+            "antibot_penalty=0.1",
+        ]
+
+    def test_replay_rejects_bad_vary(self, isolated_cli):
+        with pytest.raises(SystemExit, match="--vary"):
+            isolated_cli.replay(vary=["method_weight"])
+
+
 class TestEmbedding:
     def test_embedding_shape(self, isolated_cli):
         import numpy as np
@@ -579,3 +1441,51 @@ class TestEmbedding:
         sim_related = float(np.dot(v1, v2))
         sim_unrelated = float(np.dot(v1, v3))
         assert sim_related > sim_unrelated
+
+
+class TestEventSink:
+    def _event_lines(self, isolated_cli):
+        log_path = isolated_cli.LOG_DIR / "events.jsonl"
+        if not log_path.exists():
+            return []
+        return [line for line in log_path.read_text().splitlines() if line.strip()]
+
+    def test_buffered_events_flush_on_exit(self, isolated_cli):
+        with isolated_cli._buffered_events():
+            isolated_cli._append_event("a1", "note", "first")
+            isolated_cli._append_event("a1", "note", "second")
+            assert self._event_lines(isolated_cli) == []
+        lines = self._event_lines(isolated_cli)
+        assert [json.loads(line)["msg"] for line in lines] == ["first", "second"]
+        short = isolated_cli.SHORT_MEMORY_JSONL.read_text().splitlines()
+        assert len(short) == 2
+
+    def test_buffered_events_flush_on_exception(self, isolated_cli):
+        with pytest.raises(RuntimeError):
+            with isolated_cli._buffered_events():
+                isolated_cli._append_event("a1", "note", "kept")
+                raise RuntimeError("boom")
+        assert len(self._event_lines(isolated_cli)) == 1
+
+    def test_buffered_events_flush_when_full(self, isolated_cli):
+        with isolated_cli._buffered_events(max_buffer=2):
+            for i in range(3):
+                isolated_cli._append_event("a1", "note", f"n{i}")
+            assert len(self._event_lines(isolated_cli)) == 2
+        assert len(self._event_lines(isolated_cli)) == 3
+
+    def test_buffered_events_redacts_once_per_event(self, isolated_cli):
+        with isolated_cli._buffered_events():
+            isolated_cli._append_event("a1", "note", "mail user@example.com")
+        event = json.loads(self._event_lines(isolated_cli)[0])
+        short = json.loads(isolated_cli.SHORT_MEMORY_JSONL.read_text().splitlines()[0])
+        assert event["msg"] == "mail [REDACTED_EMAIL]"
+        assert short["text"] == event["msg"]
+
+    def test_pii_in_event_raises_at_call_site(self, isolated_cli):
+        ssn_like = "123-45-" + "6789"
+        with isolated_cli._buffered_events():
+            isolated_cli._append_event("a1", "note", "ok")
+            with pytest.raises(ValueError, match="High-risk PII"):
+                isolated_cli._append_event("a1", "note", f"ssn {ssn_like}")
+        assert len(self._event_lines(isolated_cli)) == 1
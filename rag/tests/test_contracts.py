@@ -6,9 +6,17 @@ import pytest
 
 from contracts import (
     CONTRACT_RETRIEVE_V1,
+    CONTRACT_RETRIEVE_V2,
+    RETRIEVE_V2_MAX_PAGE,
     ContractError,
     build_retrieve_envelope,
     build_retrieve_request,
+    build_retrieve_request_v2,
+    decode_retrieve_cursor,
+    encode_retrieve_cursor,
+    iter_retrieve_ndjson,
+    iter_retrieve_ndjson_items,
+    iter_validated_retrieve_items,
     validate_retrieve_item,
     validate_retrieve_payload,
 )
@@ -28,6 +36,16 @@ class TestRetrieveContracts:
         assert req["status"] == "Applied"
         assert req["method"] == "ashby"
 
+    def test_build_retrieve_request_date_bounds(self):
+        base = {"query": "ml", "k": 1, "status": None, "method": None}
+        req = build_retrieve_request(**base, since=" 2026-02 ", until="2026-03-15")
+        assert (req["since"], req["until"]) == ("2026-02", "2026-03-15")
+        assert build_retrieve_request(**base)["since"] is None
+        with pytest.raises(ContractError, match="YYYY-MM"):
+            build_retrieve_request(**base, until="2026-02-30")
+        with pytest.raises(ContractError, match="after until"):
+            build_retrieve_request(**base, since="2026-04", until="2026-03-31")
+
     def test_build_retrieve_request_rejects_empty_query(self):
         with pytest.raises(ContractError, match="non-empty"):
             build_retrieve_request(query="  ", k=5, status=None, method=None)
@@ -126,3 +144,128 @@ class TestStructuredAdapter:
         payload = json.loads(out)
         assert payload["contract"] == CONTRACT_RETRIEVE_V1
         assert payload["provider"] == "local_fusion_v1"
+
+
+def _item(n):
+    return {
+        "app_id": f"a{n}",
+        "company": "Acme",
+        "role": "ML Engineer",
+        "status": "Applied",
+        "method": "ashby",
+        "tags": ["ai"],
+        "score": 1.0 / (n + 1),
+        "context": "company=Acme",
+        "evidence": [],
+    }
+
+
+class TestRetrieveV2Contracts:
+    def _request(self, **overrides):
+        fields = {"query": "ml", "k": 2, "status": None, "method": None}
+        return build_retrieve_request_v2(**{**fields, **overrides})
+
+    def test_cursor_round_trip_ignores_page_size(self):
+        cursor = encode_retrieve_cursor(request=self._request(), index_version="v1", offset=4)
+        req = self._request(k=10, cursor=cursor)
+        assert req["cursor"] == cursor
+        assert decode_retrieve_cursor(cursor, request=req, index_version="v1") == 4
+
+    def test_cursor_rejects_other_request_index_or_garbage(self):
+        cursor = encode_retrieve_cursor(request=self._request(), index_version="v1", offset=2)
+        with pytest.raises(ContractError, match="does not match"):
+            decode_retrieve_cursor(cursor, request=self._request(query="sre"), index_version="v1")
+        with pytest.raises(ContractError, match="stale"):
+            decode_retrieve_cursor(cursor, request=self._request(), index_version="v2")
+        with pytest.raises(ContractError, match="malformed"):
+            decode_retrieve_cursor("not-a-cursor", request=self._request(), index_version="v1")
+
+    def test_ndjson_stream_round_trip(self):
+        req = self._request()
+        lines = list(
+            iter_retrieve_ndjson(
+                request=req,
+                results=iter([_item(2), _item(3)]),
+                provider="local",
+                index_version="v1",
+                offset=2,
+                total=5,
+            )
+        )
+        assert all("\n" not in line and ": " not in line for line in lines)
+        header, end = json.loads(lines[0]), json.loads(lines[-1])
+        assert header["contract"] == CONTRACT_RETRIEVE_V2
+        assert [json.loads(line)["rank"] for line in lines[1:-1]] == [2, 3]
+        assert end["count"] == 2
+        assert decode_retrieve_cursor(end["next_cursor"], request=req, index_version="v1") == 4
+        assert header["offset"] == 2
+        items = list(iter_retrieve_ndjson_items(lines))
+        assert [(i["rank"], i["app_id"]) for i in items] == [(2, "a2"), (3, "a3")]
+
+    def test_ndjson_last_page_has_no_cursor(self):
+        lines = list(
+            iter_retrieve_ndjson(
+                request=self._request(),
+                results=[_item(0)],
+                provider="local",
+                index_version="v1",
+                offset=4,
+                total=5,
+            )
+        )
+        assert json.loads(lines[-1])["next_cursor"] is None
+
+    def test_ndjson_reader_validates_incrementally(self):
+        good = list(
+            iter_retrieve_ndjson(
+                request=self._request(),
+                results=[_item(0), _item(1)],
+                provider="local",
+                index_version="v1",
+                total=2,
+            )
+        )
+        stream = iter_retrieve_ndjson_items(good[:-1])
+        assert next(stream)["app_id"] == "a0"
+        assert next(stream)["app_id"] == "a1"
+        with pytest.raises(ContractError, match="without an end line"):
+            next(stream)
+        with pytest.raises(ContractError, match="start with a v2 header"):
+            list(iter_retrieve_ndjson_items(good[1:]))
+        bad = json.dumps({**json.loads(good[1]), "tags": "ai"})
+        with pytest.raises(ContractError, match="tags"):
+            list(iter_retrieve_ndjson_items([good[0], bad, good[-1]]))
+        gap = json.dumps({**json.loads(good[2]), "rank": 5})
+        with pytest.raises(ContractError, match="rank 5, expected 1"):
+            list(iter_retrieve_ndjson_items([good[0], good[1], gap, good[-1]]))
+        shifted = json.dumps({**json.loads(good[0]), "offset": 3})
+        with pytest.raises(ContractError, match="expected 3"):
+            list(iter_retrieve_ndjson_items([shifted, *good[1:]]))
+
+    def test_page_and_stream_limits(self):
+        many = (_item(n) for n in range(RETRIEVE_V2_MAX_PAGE + 1))
+        with pytest.raises(ContractError, match="cannot exceed"):
+            list(
+                iter_retrieve_ndjson(
+                    request=self._request(), results=many, provider="local", index_version="v1"
+                )
+            )
+        assert len(list(iter_validated_retrieve_items([_item(0)] * 3, limit=3))) == 3
+        with pytest.raises(ContractError, match="exceeds 512"):
+            self._request(cursor="x" * 513)
+
+    def test_adapter_streams_v2(self):
+        adapter = get_structured_adapter("local")
+        req = adapter.normalize_retrieve_request_v2(query="ml", k=1, status=None, method=None)
+        assert adapter.retrieve_offset(req, index_version="v1") == 0
+        lines = list(
+            adapter.iter_retrieve_ndjson(
+                request=req, results=[_item(0)], index_version="v1", offset=0, total=3
+            )
+        )
+        assert json.loads(lines[0])["provider"] == "local_fusion_v1"
+        cursor = json.loads(lines[-1])["next_cursor"]
+        nxt = adapter.normalize_retrieve_request_v2(
+            query="ml", k=1, status=None, method=None, cursor=cursor
+        )
+        assert adapter.retrieve_offset(nxt, index_version="v1") == 1
@@ -2,7 +2,7 @@
 
 import pytest
 
-from distributed import create_runtime
+from distributed import create_runtime, load_skew, plan_lpt
 
 
 def test_runtime_off_mode():
@@ -32,3 +32,24 @@ def test_runtime_on_without_world_size_fails(monkeypatch):
 def test_runtime_invalid_mode_raises():
     with pytest.raises(ValueError, match="Unknown dist mode"):
         create_runtime(mode="banana")
+
+
+def test_plan_lpt_balances_heaviest_first():
+    costs = {"a": 7.0, "b": 5.0, "c": 4.0, "d": 3.0, "e": 1.0}
+    owner, loads = plan_lpt(costs, 2)
+    assert owner == {"a": 0, "b": 1, "c": 1, "d": 0, "e": 1}
+    assert loads == [10.0, 10.0]
+    assert load_skew(loads) == 1.0
+
+
+def test_plan_lpt_is_deterministic_on_ties():
+    costs = {k: 1.0 for k in "dcba"}
+    owner, loads = plan_lpt(costs, 3)
+    assert owner == {"a": 0, "b": 1, "c": 2, "d": 0}
+    assert plan_lpt(dict(reversed(list(costs.items()))), 3) == (owner, loads)
+
+
+def test_load_skew_edges():
+    assert load_skew([]) == 1.0
+    assert load_skew([0.0, 0.0]) == 1.0
+    assert load_skew([3.0, 1.0]) == 1.5
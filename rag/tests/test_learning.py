@@ -7,6 +7,8 @@ import json
 import sys
 from pathlib import Path
 
+import pytest
+
 
 def _load_learning_module():
     module_path = Path(__file__).resolve().parents[1] / "learning.py"
@@ -219,9 +221,194 @@ def test_generate_learning_report_script_writes_report(tmp_path):
             str(report),
             "--top-k",
             "5",
+            "--history-dir",
+            str(tmp_path / "history"),
         ]
     )
 
     assert rc == 0
     payload = json.loads(report.read_text(encoding="utf-8"))
     assert payload["ready_ranked"][0]["company"] == "Vercel"
+    assert list((tmp_path / "history" / "learning").glob("month=*/snapshot-*.parquet"))
+
+
+def _report_at(mod, iso: str, arms):
+    report = mod.build_learning_report(
+        [{"Company": "A", "Role": "R", "Status": "Applied", "Career Page URL": "https://jobs.ashbyhq.com/a/1"}],
+        arms,
+    )
+    report["generated_at_iso"] = iso
+    return report
+
+
+def test_learning_snapshot_rows_cover_all_arms_status_and_friction():
+    mod = _load_learning_module()
+    arms = {f"cat:t{i}": {"alpha": 2.0, "beta": 1.0, "pulls": 1} for i in range(15)}
+    report = _report_at(mod, "2026-03-01T00:00:00+00:00", arms)
+    rows = mod.learning_snapshot_rows(report, arms)
+
+    arm_keys = {r["key"] for r in rows if r["kind"] == "arm"}
+    assert len(arm_keys) == 15  # not truncated to top_k
+    status_rows = [r for r in rows if r["kind"] == "status"]
+    assert [(r["key"], r["metric"], r["value"]) for r in status_rows] == [("Applied", "count", 1.0)]
+    assert any(r["kind"] == "method_friction" and r["key"] == "method:ashby" for r in rows)
+    assert {r["ts_epoch_ms"] for r in rows} == {1772323200000}
+
+
+def test_append_snapshot_and_query_trend(tmp_path):
+    mod = _load_learning_module()
+    history = tmp_path / "history"
+    for iso, alpha in (
+        ("2026-01-15T00:00:00+00:00", 1.0),
+        ("2026-02-10T00:00:00+00:00", 3.0),
+        ("2026-03-05T00:00:00+00:00", 7.0),
+    ):
+        arms = {"method:ashby": {"alpha": alpha, "beta": 1.0, "pulls": int(alpha)}}
+        mod.append_learning_snapshot(history, _report_at(mod, iso, arms), arms)
+
+    parts = sorted(p.name for p in (history / "learning").iterdir())
+    assert parts == ["month=2026-01", "month=2026-02", "month=2026-03"]
+
+    points = mod.query_learning_trend(history, key="method:ashby")
+    assert [round(v, 3) for _, v in points] == [0.5, 0.75, 0.875]
+
+    since = mod._iso_to_epoch_ms("2026-02-01T00:00:00+00:00")
+    recent = mod.query_learning_trend(history, key="method:ashby", since_ms=since)
+    assert len(recent) == 2
+
+    counts = mod.query_learning_trend(history, key="Applied", metric="count")
+    assert [v for _, v in counts] == [1.0, 1.0, 1.0]
+    assert mod.query_learning_trend(tmp_path / "missing", key="method:ashby") == []
+
+
+
+def test_snapshot_with_unparsable_timestamp_is_skipped(tmp_path):
+    mod = _load_learning_module()
+    arms = {"method:ashby": {"alpha": 2.0, "beta": 1.0, "pulls": 1}}
+    report = _report_at(mod, "not-a-timestamp", arms)
+
+    assert mod._iso_to_epoch_ms("not-a-timestamp") is None
+    assert mod.learning_snapshot_rows(report, arms) == []
+    with pytest.raises(RuntimeError, match="unparsable generated_at_iso"):
+        mod.append_learning_snapshot(tmp_path / "history", report, arms)
+    assert not (tmp_path / "history").exists()
+
+def _reference_rank(mod, rows, arms, status_filter):
+    ranked = []
+    for idx, row in enumerate(rows):
+        status = str(row.get("Status", "")).strip()
+        if status_filter == "ready" and not mod.is_ready_status(status):
+            continue
+        if status_filter == "draft" and not mod.is_draft_status(status):
+            continue
+        features = mod.learning_features_for_row(row, arms)
+        features["row_index"] = idx
+        ranked.append(features)
+    ranked.sort(
+        key=lambda item: (
+            item["lane_priority"],
+            -float(item["adjusted_score"]),
+            item["company"].lower(),
+            item["role"].lower(),
+        )
+    )
+    return ranked
+
+
+def test_ranking_context_matches_per_row_features_across_updates():
+    mod = _load_learning_module()
+    arms = {
+        "method:ashby": {"alpha": 1.5, "beta": 4.5, "pulls": 4},
+        "method:greenhouse": {"alpha": 4.0, "beta": 2.0, "pulls": 4},
+        "cat:ai": {"alpha": 2.0, "beta": 3.0, "pulls": 3},
+        "cat:platform": {"alpha": 3.0, "beta": 1.0, "pulls": 2},
+        "cat:infra": {"alpha": 1.2, "beta": 4.8, "pulls": 4},
+    }
+    urls = [
+        "https://jobs.ashbyhq.com/a/1",
+        "https://job-boards.greenhouse.io/b/jobs/2",
+        "https://example.com/jobs/3",
+    ]
+    notes = ["", "possible spam", "Needs manual completion", "anti-bot; manual rescue evidence"]
+    tags = ["ai;infra", "platform", "", "ai;ai;unknown", "infra;platform;ai"]
+    rows = [
+        {
+            "Company": f"Co {i % 5}",
+            "Role": f"Role {i % 3}",
+            "Status": ["ReadyToSubmit", "Draft", "Applied"][i % 3],
+            "Career Page URL": urls[i % 3],
+            "Tags": tags[i % 5],
+            "Submission Lane": "ci_auto:x" if i % 4 == 0 else "manual",
+            "Notes": notes[i % 4],
+        }
+        for i in range(40)
+    ]
+    context = mod.RankingContext(arms)
+    for status_filter in ("ready", "draft"):
+        assert context.rank(rows, status_filter=status_filter) == _reference_rank(
+            mod, rows, arms, status_filter
+        )
+
+    rows[1]["Status"] = "ReadyToSubmit"
+    rows[3]["Notes"] = "recaptcha_score_below_threshold"
+    rows[6]["Tags"] = "platform;ai"
+    rows.append(dict(rows[0], Company="New Co"))
+    assert context.rank(rows) == _reference_rank(mod, rows, arms, "ready")
+    assert context.rank(rows, max_rows=4) == _reference_rank(mod, rows, arms, "ready")[:4]
+    assert mod.rank_rows_by_learning(rows, arms, context=context) == context.rank(rows)
+
+
+def test_ranking_context_for_reloads_only_when_arms_change(tmp_path):
+    mod = _load_learning_module()
+    path = tmp_path / "arms.json"
+    path.write_text(json.dumps({"method:ashby": {"alpha": 1, "beta": 1}}), encoding="utf-8")
+    first = mod.ranking_context_for(path)
+    assert mod.ranking_context_for(path) is first
+
+    path.write_text(json.dumps({"method:ashby": {"alpha": 19, "beta": 1}}), encoding="utf-8")
+    second = mod.ranking_context_for(path)
+    assert second is not first
+    assert second.arms["method:ashby"]["alpha"] == 19
+    assert mod.ranking_context_for(tmp_path / "missing.json").arms == {}
+
+
+def test_build_learning_report_reuses_context_across_row_edits():
+    mod = _load_learning_module()
+    arms = {
+        "method:ashby": {"alpha": 1.5, "beta": 4.5, "pulls": 4},
+        "method:greenhouse": {"alpha": 4.0, "beta": 2.0, "pulls": 4},
+        "cat:ai": {"alpha": 2.0, "beta": 3.0, "pulls": 3},
+    }
+    rows = [
+        {
+            "Company": f"Co {i}",
+            "Role": "Engineer",
+            "Status": ["ReadyToSubmit", "Draft", "Applied", "Quarantined"][i % 4],
+            "Career Page URL": ["https://jobs.ashbyhq.com/a/1", "https://job-boards.greenhouse.io/b"][i % 2],
+            "Tags": "ai" if i % 3 else "",
+            "Notes": "possible spam" if i % 5 == 0 else "",
+        }
+        for i in range(12)
+    ]
+
+    def stable(report):
+        return {k: v for k, v in report.items() if k != "generated_at_iso"}
+
+    context = mod.RankingContext(arms)
+    first = mod.build_learning_report(rows, arms, context=context)
+    assert stable(first) == stable(mod.build_learning_report(rows, arms))
+    assert first["method_friction"]["ashby"] == {
+        "rows": 6,
+        "ready_rows": 3,
+        "applied_rows": 3,
+        "antibot_count": 2,
+        "manual_block_count": 0,
+    }
+
+    rows[2]["Status"] = "ReadyToSubmit"
+    rows[4]["Notes"] = "Needs manual completion"
+    rows[7]["Career Page URL"] = "https://example.com/jobs/7"
+    again = mod.build_learning_report(rows, arms, context=context)
+    assert stable(again) == stable(mod.build_learning_report(rows, arms))
+    assert again["status_counts"]["ReadyToSubmit"] == 4
+    assert again["method_friction"]["direct"]["rows"] == 1
@@ -4,9 +4,12 @@ from pathlib import Path
 
 import pytest
 from memalign import (
+    add_epoch_ms,
     append_jsonl,
     build_long_memory_entry,
     build_short_memory_entry,
+    compact_short_memory,
+    epoch_ms,
     infer_application_method,
     load_jsonl,
     long_memory_scores,
@@ -16,6 +19,7 @@ from memalign import (
     recency_scores,
     slug,
     stable_id,
+    write_jsonl_atomic,
 )
 
 
@@ -227,6 +231,29 @@ class TestMemoryHelpers:
         scores = recency_scores(rows, now_ts="2026-02-19T00:00:00+00:00")
         assert scores["a"] > scores["b"]
 
+    def test_recency_scores_matches_scalar_decay(self):
+        import math
+
+        rows = [
+            {"app_id": "a", "ts": "2026-02-01T12:00:00+00:00", "score_hint": 0.7},
+            {"app_id": "a", "ts": "2026-02-10T00:00:00Z", "score_hint": 0.35},
+            {"app_id": "b", "ts": "2026-01-01T00:00:00+00:00", "score_hint": 0.9},
+            {"app_id": "c", "ts": "not-a-date", "score_hint": 0.9},
+        ]
+        scores = recency_scores(rows, now_ts="2026-02-19T00:00:00+00:00")
+
+        def expected(age_days: float, hint: float) -> float:
+            return math.exp(-math.log(2.0) * age_days / 14.0) * hint
+
+        assert scores["a"] == pytest.approx(max(expected(17.5, 0.7), expected(9, 0.35)))
+        assert scores["b"] == pytest.approx(expected(49, 0.9))
+        assert "c" not in scores
+
+    def test_recency_scores_prefers_pre_parsed_epoch(self):
+        rows = [{"app_id": "a", "ts": "garbage", "ts_epoch_ms": 1771459200000}]
+        scores = recency_scores(rows, now_ts="2026-02-19T00:00:00+00:00")
+        assert scores["a"] == pytest.approx(0.35)
+
     def test_long_memory_scores_uses_priority(self):
         rows = [
             {"app_id": "a", "priority": 0.9},
@@ -234,3 +261,92 @@ class TestMemoryHelpers:
         ]
         scores = long_memory_scores(rows)
         assert scores["a"] > scores["b"]
+
+
+class TestEpochTimestamps:
+    def test_epoch_ms_utc(self):
+        assert epoch_ms("2026-02-19T00:00:00+00:00") == 1771459200000
+        assert epoch_ms("2026-02-19T00:00:00Z") == 1771459200000
+        assert epoch_ms("") is None
+
+    def test_memory_entries_carry_epoch(self):
+        ts = "2026-02-19T00:00:00+00:00"
+        short = build_short_memory_entry(app_id="a", event_type="note", msg="m", ts=ts)
+        long = build_long_memory_entry({"app_id": "a"}, ts=ts)
+        assert short["ts_epoch_ms"] == long["ts_epoch_ms"] == 1771459200000
+
+    def test_add_epoch_ms_backfills_missing_only(self):
+        rows = [
+            {"ts": "2026-02-19T00:00:00+00:00"},
+            {"ts": "2026-02-19T00:00:00+00:00", "ts_epoch_ms": 5},
+            {"ts": ""},
+        ]
+        out, changed = add_epoch_ms(rows)
+        assert changed == 1
+        assert out[0]["ts_epoch_ms"] == 1771459200000
+        assert out[1]["ts_epoch_ms"] == 5
+        assert "ts_epoch_ms" not in out[2]
+
+
+class TestCompactShortMemory:
+    NOW = "2026-06-01T00:00:00+00:00"
+
+    def test_folds_decayed_rows_into_per_app_summary(self):
+        rows = [
+            {"app_id": "a", "ts": "2026-01-01T00:00:00+00:00", "event_type": "note"},
+            {"app_id": "a", "ts": "2026-01-02T00:00:00+00:00", "event_type": "note"},
+            {"app_id": "a", "ts": "2026-05-31T00:00:00+00:00", "event_type": "note"},
+        ]
+        out, stats = compact_short_memory(rows, now_ts=self.NOW)
+        assert stats["folded"] == 2
+        summaries = [r for r in out if r.get("kind") == "episodic_summary"]
+        assert len(summaries) == 1
+        assert summaries[0]["folded_count"] == 2
+        assert summaries[0]["ts"] == "2026-01-02T00:00:00+00:00"
+        assert len(out) == 2
+
+    def test_keeps_outcome_rows_and_drops_anonymous_rows(self):
+        rows = [
+            {
+                "app_id": "a",
+                "ts": "2026-01-01T00:00:00+00:00",
+                "event_type": "outcome",
+                "outcome": "interview",
+            },
+            {"app_id": None, "ts": "2026-01-01T00:00:00+00:00", "event_type": "build_ok"},
+        ]
+        out, stats = compact_short_memory(rows, now_ts=self.NOW)
+        assert out == [rows[0]]
+        assert stats["dropped"] == 1
+
+    def test_recompaction_merges_existing_summary(self):
+        old = [
+            {"app_id": "a", "ts": "2026-01-01T00:00:00+00:00", "event_type": "note"},
+            {"app_id": "a", "ts": "2026-01-03T00:00:00+00:00", "event_type": "sync"},
+        ]
+        first, _ = compact_short_memory(old, now_ts=self.NOW)
+        more = first + [
+            {"app_id": "a", "ts": "2026-01-05T00:00:00+00:00", "event_type": "note"}
+        ]
+        second, _ = compact_short_memory(more, now_ts=self.NOW)
+        assert len(second) == 1
+        assert second[0]["folded_count"] == 3
+        assert second[0]["event_types"] == {"note": 2, "sync": 1}
+
+    def test_recency_scores_unchanged_for_recent_rows(self):
+        rows = [
+            {"app_id": "a", "ts": "2026-05-30T00:00:00+00:00", "score_hint": 0.9},
+            {"app_id": "b", "ts": "2026-01-01T00:00:00+00:00", "score_hint": 0.35},
+        ]
+        out, _ = compact_short_memory(rows, now_ts=self.NOW)
+        before = recency_scores(rows, now_ts=self.NOW)
+        after = recency_scores(out, now_ts=self.NOW)
+        assert after["a"] == before["a"]
+        assert after["b"] == pytest.approx(before["b"])
+
+    def test_write_jsonl_atomic_replaces_file(self, tmp_path: Path):
+        path = tmp_path / "memory_short.jsonl"
+        append_jsonl(path, {"app_id": "old"})
+        write_jsonl_atomic(path, [{"app_id": "new"}])
+        assert load_jsonl(path) == [{"app_id": "new"}]
+        assert [p.name for p in tmp_path.iterdir()] == ["memory_short.jsonl"]
@@ -0,0 +1,163 @@
+"""Tests for replay.py — offline ranking-policy replay."""
+
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+from learning import learning_features_for_row
+from replay import (
+    PRODUCTION_POLICY,
+    RankingPolicy,
+    build_replay_history,
+    evaluate_policies,
+    policy_grid,
+    rank_in_snapshot,
+    score_policies,
+)
+from rlhf import ThompsonModel
+
+APPS = {
+    "a": {"method": "ashby", "tags": ["ai", "remote"], "antibot": False, "manual": False},
+    "b": {"method": "ashby", "tags": ["ai"], "antibot": True, "manual": False},
+    "c": {"method": "lever", "tags": ["remote", "infra"], "antibot": False, "manual": True},
+    "d": {"method": "greenhouse", "tags": [], "antibot": False, "manual": False},
+}
+ROWS = {
+    "b": {"Career Page URL": "https://jobs.ashbyhq.com/b/1", "Tags": "ai", "Notes": "anti-bot"},
+    "c": {
+        "Career Page URL": "https://jobs.lever.co/c/1",
+        "Tags": "remote; infra",
+        "Notes": "manual rescue",
+    },
+    "d": {"Career Page URL": "https://job-boards.greenhouse.io/d/jobs/1", "Tags": ""},
+}
+
+
+def _event(day, app_id, outcome):
+    return {"ts": f"2026-03-{day:02d}T12:00:00", "app_id": app_id, "outcome": outcome}
+
+
+class TestPolicyGrid:
+    def test_cartesian_product_named_by_overrides(self):
+        grid = policy_grid({"tag_weight": [0.2, 0.4], "method_weight": [0.5]})
+        assert [p.name for p in grid] == [
+            "method_weight=0.5,tag_weight=0.2",
+            "method_weight=0.5,tag_weight=0.4",
+        ]
+        assert grid[0].antibot_penalty == PRODUCTION_POLICY.antibot_penalty
+        assert policy_grid({}) == [PRODUCTION_POLICY]
+
+    def test_unknown_weight_rejected(self):
+        with pytest.raises(ValueError, match="bogus"):
+            policy_grid({"bogus": [1.0]})
+
+
+class TestHistory:
+    def test_snapshot_only_sees_earlier_days(self):
+        events = [_event(1, "a", "interview"), _event(3, "b", "offer"), _event(3, "c", "rejected")]
+        history = build_replay_history(events, APPS, window_days=1)
+        assert history.days == ["2026-03-01", "2026-03-03"]
+        assert history.app_ids == ["a", "b", "c"]
+        # Day 1: no arm learned yet. Day 3: only a's interview, not b's same-day offer.
+        assert history.has_method.tolist() == [0.0, 1.0, 0.0]
+        assert history.tag_n.tolist() == [0.0, 1.0, 1.0]
+        assert history.method_mean[1] == pytest.approx(1.8 / 3.0)
+
+    def test_window_carries_backlog_into_snapshot(self):
+        events = [_event(1, "a", "interview"), _event(2, "b", "offer"), _event(9, "c", "blocked")]
+        history = build_replay_history(events, APPS, window_days=3)
+        assert history.starts.tolist() == [0, 2, 3]
+        assert [history.app_ids[i] for i in history.app_index] == ["a", "b", "b", "c"]
+        assert history.logged.tolist() == [True, False, True, True]
+
+    def test_decision_day_comes_from_decided_on(self):
+        apps = {
+            "a": {**APPS["a"], "decided_on": "2026-03-01"},
+            "b": {**APPS["b"], "decided_on": "2026-03-02"},
+        }
+        events = [_event(2, "a", "interview"), _event(5, "b", "offer")]
+        history = build_replay_history(events, apps, window_days=1)
+        assert history.days == ["2026-03-01", "2026-03-02"]
+        assert history.app_ids == ["a", "b"]
+        # b is decided on the day a's outcome is logged, so it must not see it.
+        assert history.has_method.tolist() == [0.0, 0.0]
+        assert history.reward.tolist() == [0.8, 1.0]
+
+    def test_invalid_decided_on_falls_back_to_first_event(self):
+        apps = {"a": {**APPS["a"], "decided_on": "2026-03"}, "b": APPS["b"]}
+        events = [_event(4, "b", "offer"), _event(3, "a", "interview")]
+        history = build_replay_history(events, apps, window_days=1)
+        assert history.days == ["2026-03-03", "2026-03-04"]
+        assert history.app_ids == ["a", "b"]
+
+    def test_unknown_apps_and_outcomes_ignored(self):
+        events = [_event(1, "zzz", "offer"), _event(1, "a", "ghosted")]
+        history = build_replay_history(events, APPS)
+        assert history.candidates == 0
+        assert evaluate_policies(history, [PRODUCTION_POLICY])["snapshots"] == 0
+
+    def test_production_scores_match_learning_features(self, tmp_path):
+        prior = [("a", "interview"), ("b", "blocked"), ("c", "response"), ("a", "rejected")]
+        events = [_event(1 + i, app_id, outcome) for i, (app_id, outcome) in enumerate(prior)]
+        events += [_event(9, app_id, "no_response") for app_id in ("b", "c", "d")]
+        history = build_replay_history(events, APPS, window_days=1)
+
+        model = ThompsonModel(tmp_path / "arms.json")
+        for app_id, outcome in prior:
+            model.record_outcome(APPS[app_id]["tags"], APPS[app_id]["method"], outcome, save=False)
+        arms = {name: asdict(arm) for name, arm in model.arms.items()}
+
+        scores = score_policies(history, [PRODUCTION_POLICY])[0]
+        last = history.starts[-1]
+        for idx in range(last, history.candidates):
+            app_id = history.app_ids[history.app_index[idx]]
+            expected = learning_features_for_row(ROWS[app_id], arms)["adjusted_score"]
+            assert scores[idx] == pytest.approx(expected, abs=1e-4), app_id
+
+
+class TestEvaluate:
+    def _history(self):
+        apps = {
+            f"{name}{day}": {"method": method, "tags": [], "antibot": name == "hi"}
+            for day in (1, 5)
+            for name, method in (("hi", "ashby"), ("lo", "lever"))
+        }
+        events = [
+            _event(1, "hi1", "offer"),
+            _event(1, "lo1", "blocked"),
+            _event(5, "hi5", "interview"),
+            _event(5, "lo5", "blocked"),
+        ]
+        return build_replay_history(events, apps, window_days=1)
+
+    def test_rank_orders_by_score_then_decision_order(self):
+        history = self._history()
+        no_penalty = RankingPolicy(name="no_penalty", antibot_penalty=0.0)
+        ranks = rank_in_snapshot(history, score_policies(history, [PRODUCTION_POLICY, no_penalty]))
+        # Day 1: both score 0.46 before the anti-bot penalty on "hi1".
+        # Day 5: the ashby arm learned hi1's offer, outweighing the penalty.
+        assert ranks[0].tolist() == [1, 0, 0, 1]
+        assert ranks[1].tolist() == [0, 1, 0, 1]
+
+    def test_metrics_against_baseline(self):
+        history = self._history()
+        report = evaluate_policies(
+            history, [RankingPolicy(name="no_penalty", antibot_penalty=0.0)], k=1
+        )
+        assert report["snapshots"] == 2
+        assert report["decisions"] == 4
+        assert report["logged_reward"] == pytest.approx(0.45)
+        base, alt = report["baseline"], report["policies"][0]
+        assert base["reward_at_k"] == pytest.approx(0.4)
+        assert alt["reward_at_k"] == pytest.approx(0.9)
+        assert alt["lift_vs_baseline"] == pytest.approx(0.5)
+        assert alt["ndcg_at_k"] == pytest.approx(1.0)
+        assert alt["spearman_vs_baseline"] == pytest.approx(0.0)
+        assert alt["overlap_at_k_vs_baseline"] == pytest.approx(0.5)
+
+    def test_many_policies_vectorized(self):
+        history = self._history()
+        grid = policy_grid({"method_weight": np.linspace(0, 1, 11), "tag_weight": [0.0, 0.4]})
+        report = evaluate_policies(history, grid, k=1)
+        assert len(report["policies"]) == 22
+        assert all(0.0 <= r["reward_at_k"] <= 1.0 for r in report["policies"])
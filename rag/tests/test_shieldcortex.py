@@ -1,6 +1,9 @@
 """Tests for shieldcortex.py — PII detection and redaction."""
 
+import random
+
 import pytest
+import shieldcortex
 from shieldcortex import assert_no_high_risk_pii, gate_text, redact, scan_pii
 
 
@@ -100,3 +103,151 @@ class TestGateText:
         ssn_like = "123-45-" + "6789"
         with pytest.raises(ValueError, match="High-risk PII detected"):
             gate_text(f"SSN: {ssn_like}", context="unit")
+
+
+_FUZZ_TOKENS = [
+    "123-45-6789", "a@b.co", "x.y@ex.com", "555-123-4567", "(555) 123-4567",
+    "+1 555 123 4567", "01/02/1990", "12/31/2020", "13/01/2000", "5551234567",
+    "DOB", "dob:", "date of birth", "2020", "ab.cd", " ", "-", ".", "@", "(",
+    ")", "+", "/", "1", "12", "x", "_", "%", "\n",
+]
+
+
+class TestSinglePassParity:
+    """The single-pass scanner must match the multipass reference exactly."""
+
+    @staticmethod
+    def _assert_parity(text):
+        assert scan_pii(text) == shieldcortex._scan_pii_multipass(text)
+        assert redact(text) == shieldcortex._redact_multipass(text)
+
+    def test_randomized_token_soup(self):
+        rng = random.Random(1234)
+        for _ in range(4000):
+            n = rng.randint(1, 14)
+            self._assert_parity("".join(rng.choice(_FUZZ_TOKENS) for _ in range(n)))
+
+    def test_randomized_characters(self):
+        rng = random.Random(99)
+        alphabet = "0123456789-/.@ ()+abDOBx_%\n"
+        for _ in range(4000):
+            n = rng.randint(1, 40)
+            self._assert_parity("".join(rng.choice(alphabet) for _ in range(n)))
+
+    def test_adjacent_hits_fall_back_to_multipass(self):
+        text = "a@b.com(555) 123-4567"
+        assert shieldcortex._scan_matches(text) is None
+        # Multipass redacts the email first, which removes the \b before "(".
+        assert redact(text) == "[REDACTED_EMAIL]([REDACTED_PHONE]"
+
+    def test_dob_window_uses_substituted_text(self):
+        email = "someone.with.a.very.long.name@example-company.com"
+        text = f"dob {email} 01/02/1990"
+        assert scan_pii(text) == []
+        assert redact(text) == "dob [REDACTED_EMAIL] [REDACTED_DOB]"
+        self._assert_parity(text)
+
+    def test_findings_list_ssns_before_dobs(self):
+        text = "DOB 01/02/1990 and SSN 123-45-6789"
+        assert [f.kind for f in scan_pii(text)] == ["ssn", "dob"]
+        self._assert_parity(text)
+
+    def test_application_date_kept_without_context(self):
+        text = "Senior ML Engineer at Acme, applied 02/18/2026 via Ashby."
+        assert shieldcortex._scan_matches(text) == [("date", 36, 46)]
+        assert gate_text(text).text == text
+
+
+class TestGateMemo:
+    @pytest.fixture(autouse=True)
+    def _fresh_memo(self):
+        shieldcortex.reset_gate_memo()
+        yield
+        shieldcortex.reset_gate_memo()
+
+    def test_repeated_text_hits_memo_and_skips_scan(self, monkeypatch):
+        text = "reach me at user@example.com"
+        first = gate_text(text, context="a")
+
+        def _boom(_text):
+            raise AssertionError("scanner should not run on a memo hit")
+
+        monkeypatch.setattr(shieldcortex, "_scan_matches", _boom)
+        second = gate_text(text, context="b")
+        assert second == first
+        stats = shieldcortex.gate_memo_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert stats["hit_rate"] == pytest.approx(0.5)
+
+    def test_unchanged_text_returns_caller_string(self):
+        text = "Applied for role with no PII."
+        gate_text(text)
+        result = gate_text(text)
+        assert result.action == "allow"
+        assert result.text is text
+
+    def test_memoized_block_reraises_with_current_context(self):
+        ssn_like = "123-45-" + "6789"
+        with pytest.raises(ValueError, match=r"\(first\)"):
+            gate_text(f"SSN {ssn_like}", context="first")
+        with pytest.raises(ValueError, match=r"High-risk PII detected: ssn \(second\)"):
+            gate_text(f"SSN {ssn_like}", context="second")
+        with pytest.raises(ValueError, match=r"\(third\)"):
+            assert_no_high_risk_pii(f"SSN {ssn_like}", context="third")
+        assert shieldcortex.gate_memo_stats()["hits"] == 2
+
+    def test_scan_entry_is_completed_by_gate(self):
+        text = "call 555-123-4567"
+        assert_no_high_risk_pii(text)
+        assert gate_text(text).text == "call [REDACTED_PHONE]"
+        assert gate_text(text).action == "quarantine"
+        assert shieldcortex.gate_memo_stats()["hits"] == 2
+
+    def test_memo_is_bounded(self, monkeypatch):
+        memo = shieldcortex._GateMemo(max_entries=3, max_bytes=60)
+        monkeypatch.setattr(shieldcortex, "_GATE_MEMO", memo)
+        for i in range(5):
+            gate_text(f"note {i}")
+        assert memo.stats()["entries"] == 3
+        # Each redacted text is 42 chars; the second one pushes the first out.
+        gate_text("mail a@b.co and c@d.co")
+        gate_text("mail e@f.co and g@h.co")
+        assert memo.stats()["entries"] == 1
+        assert memo.stats()["bytes"] == 42
+
+
+class TestStreamingScan:
+    @staticmethod
+    def _random_chunks(rng, text):
+        chunks, i = [], 0
+        while i < len(text):
+            n = rng.randint(1, 90)
+            chunks.append(text[i : i + n])
+            i += n
+        return chunks
+
+    def test_matches_full_text_scan_under_random_chunking(self):
+        rng = random.Random(42)
+        tokens = ["123-45-6789", "01/02/1990", "12/31/2020", "dob", "DOB:",
+                  "date of birth", " ", "x", "-", "/", "1", "\n", "filler text "]
+        for _ in range(600):
+            text = "".join(rng.choice(tokens) for _ in range(rng.randint(0, 300)))
+            want = sorted(scan_pii(text), key=lambda f: f.start)
+            got = list(shieldcortex.scan_pii_stream(self._random_chunks(rng, text)))
+            assert got == want
+
+    def test_offsets_are_absolute_across_chunks(self):
+        ssn = "123-45-" + "6789"
+        text = "a " * 500 + ssn + " b" * 250 + " DOB 04/01/1982"
+        chunks = [text[i : i + 64] for i in range(0, len(text), 64)]
+        findings = list(shieldcortex.scan_pii_stream(chunks))
+        assert [(f.kind, f.start) for f in findings] == [("ssn", 1000), ("dob", 1516)]
+        assert findings[0].excerpt == ssn
+
+    def test_file_tail_beyond_read_cap_is_checked(self, tmp_path):
+        path = tmp_path / "capture.md"
+        path.write_text("é" * 200_000 + " SSN 123-45-" + "6789\n", encoding="utf-8")
+        chunks = list(shieldcortex.iter_text_chunks(path, chunk_bytes=4097))
+        assert "".join(chunks) == path.read_text(encoding="utf-8")
+        with pytest.raises(ValueError, match=r"ssn \(capture.md\)"):
+            shieldcortex.assert_no_high_risk_pii_file(path, context="capture.md")
@@ -0,0 +1,129 @@
+"""Tests for textextract.py — DOCX/HTML text extraction and the text caches."""
+
+import os
+import zipfile
+
+from textextract import (
+    ArtifactTextCache,
+    cached_html_to_text,
+    docx_to_text,
+    html_to_text,
+    iter_docx_paragraphs,
+    looks_like_html,
+)
+
+_W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def _write_docx(path, body_xml):
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f"<w:document {_W}><w:body>{body_xml}<w:sectPr/></w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", "<Types/>")
+        zf.writestr("word/document.xml", document)
+    return path
+
+
+class TestDocx:
+    def test_paragraphs_runs_tabs_and_breaks(self, tmp_path):
+        path = _write_docx(
+            tmp_path / "resume.docx",
+            '<w:p><w:r><w:t>Jane</w:t></w:r><w:r><w:t xml:space="preserve"> Doe</w:t></w:r></w:p>'
+            "<w:p><w:r><w:t>Skills</w:t><w:tab/><w:t>Python</w:t><w:br/><w:t>Go</w:t></w:r></w:p>"
+            "<w:p/>"
+            "<w:tbl><w:tr><w:tc><w:p><w:r><w:t>&amp; cell</w:t></w:r></w:p></w:tc></w:tr></w:tbl>",
+        )
+        assert list(iter_docx_paragraphs(path)) == ["Jane Doe", "Skills\tPython\nGo", "", "& cell"]
+        assert docx_to_text(path) == "Jane Doe\nSkills\tPython\nGo\n\n& cell"
+
+    def test_small_read_chunks_give_same_text(self, tmp_path):
+        body = "".join(f"<w:p><w:r><w:t>line {i} é</w:t></w:r></w:p>" for i in range(500))
+        path = _write_docx(tmp_path / "long.docx", body)
+        assert list(iter_docx_paragraphs(path, chunk_bytes=7)) == list(iter_docx_paragraphs(path))
+
+    def test_max_chars_stops_early(self, tmp_path):
+        body = "".join(f"<w:p><w:r><w:t>{'x' * 50}</w:t></w:r></w:p>" for _ in range(100))
+        path = _write_docx(tmp_path / "big.docx", body)
+        assert len(docx_to_text(path, max_chars=120)) == 120
+
+    def test_invalid_files_return_empty(self, tmp_path):
+        not_zip = tmp_path / "fake.docx"
+        not_zip.write_text("plain text", encoding="utf-8")
+        no_doc = tmp_path / "nodoc.docx"
+        with zipfile.ZipFile(no_doc, "w") as zf:
+            zf.writestr("other.xml", "<x/>")
+        broken = tmp_path / "broken.docx"
+        with zipfile.ZipFile(broken, "w") as zf:
+            zf.writestr("word/document.xml", "<w:document><unclosed>")
+        assert docx_to_text(not_zip) == ""
+        assert docx_to_text(no_doc) == ""
+        assert docx_to_text(broken) == ""
+
+
+class TestHtml:
+    def test_extracts_visible_text_with_line_structure(self):
+        doc = (
+            "<html><head><title>R</title><style>p { color: red }</style>"
+            "<script>if (a < b) { go(); }</script></head>"
+            '<body><h1 class="name">Jane &amp; Co</h1>\n'
+            "<p>First<br/>second</p><ul><li>one</li><li>two</li></ul>"
+            "<!-- hidden --><p>  spaced\t out  </p></body></html>"
+        )
+        assert html_to_text(doc) == "R Jane & Co\nFirst\nsecond\none\ntwo\nspaced out\n"
+
+    def test_empty_and_plain_inputs(self):
+        assert html_to_text("") == ""
+        assert html_to_text(None) == ""
+        assert html_to_text("just text\n\n more") == "just text\nmore\n"
+
+    def test_looks_like_html(self):
+        assert looks_like_html("# Title\n<div class='x'>hi</div>")
+        assert looks_like_html("line<br>")
+        assert not looks_like_html("a < b and c > d")
+        assert not looks_like_html("email <me@example.com>")
+
+    def test_cached_by_content_hash(self, tmp_path, monkeypatch):
+        import textextract
+
+        cache = tmp_path / "cache"
+        doc = "<p>Hello</p>"
+        assert cached_html_to_text(doc, cache_dir=cache) == "Hello\n"
+        files = list(cache.rglob("*.txt"))
+        assert len(files) == 1
+
+        monkeypatch.setattr(textextract, "html_to_text", lambda v: "recomputed")
+        assert cached_html_to_text(doc, cache_dir=cache) == "Hello\n"
+        assert cached_html_to_text("<p>Other</p>", cache_dir=cache) == "recomputed"
+
+
+class TestArtifactTextCache:
+    def test_hits_until_file_changes(self, tmp_path):
+        path = tmp_path / "notes.md"
+        path.write_text("v1", encoding="utf-8")
+        cache = ArtifactTextCache()
+        calls = []
+
+        def loader(p):
+            calls.append(p)
+            return p.read_text(encoding="utf-8")
+
+        assert cache.get(path, loader) == "v1"
+        assert cache.get(path, loader) == "v1"
+        assert len(calls) == 1
+
+        path.write_text("v2!", encoding="utf-8")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert cache.get(path, loader) == "v2!"
+        assert cache.stats() == {"hits": 1, "misses": 2, "entries": 2}
+
+    def test_bounded_and_missing_files(self, tmp_path):
+        cache = ArtifactTextCache(max_entries=2)
+        for i in range(4):
+            p = tmp_path / f"f{i}.txt"
+            p.write_text(str(i), encoding="utf-8")
+            cache.get(p, lambda q: q.read_text(encoding="utf-8"))
+        assert cache.stats()["entries"] == 2
+        assert cache.get(tmp_path / "missing.txt", lambda q: "never") == ""
@@ -0,0 +1,214 @@
+"""Plain-text extraction for indexed and scanned artifacts.
+
+- ``.docx``: ``word/document.xml`` is streamed straight out of the zip through an
+  incremental XML parser; nothing is extracted to disk and memory stays bounded
+  by one paragraph.
+- HTML (``.html`` resumes, tag-bearing ``.md`` captures): single-pass
+  ``html.parser`` extraction, optionally cached on disk by content hash.
+- ``ArtifactTextCache``: per-process LRU of extracted text keyed by
+  (path, size, mtime_ns), so an artifact shared by many tracker rows is read and
+  decoded once per build.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+import zipfile
+from collections import OrderedDict
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_T = _W_NS + "t"
+_W_P = _W_NS + "p"
+_W_TAB = _W_NS + "tab"
+_W_BREAKS = {_W_NS + "br", _W_NS + "cr"}
+_DOCX_CHUNK_BYTES = 64 * 1024
+
+
+def iter_docx_paragraphs(path: Path, *, chunk_bytes: int = _DOCX_CHUNK_BYTES) -> Iterator[str]:
+    """Yield the text of each ``w:p`` paragraph of a .docx, in document order.
+
+    Runs (``w:t``), tabs and line breaks are honoured; paragraph elements are
+    cleared as soon as they close. Raises ``zipfile.BadZipFile``, ``KeyError``
+    (no ``word/document.xml``) or ``ET.ParseError`` on malformed input.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    parts = []
+    with zipfile.ZipFile(path) as zf, zf.open("word/document.xml") as f:
+        while True:
+            data = f.read(chunk_bytes)
+            if data:
+                parser.feed(data)
+            else:
+                parser.close()
+            for event, elem in parser.read_events():
+                tag = elem.tag
+                if event == "start":
+                    if tag == _W_TAB:
+                        parts.append("\t")
+                    elif tag in _W_BREAKS:
+                        parts.append("\n")
+                elif tag == _W_T:
+                    if elem.text:
+                        parts.append(elem.text)
+                elif tag == _W_P:
+                    yield "".join(parts)
+                    parts = []
+                    elem.clear()
+            if not data:
+                break
+    if parts:
+        yield "".join(parts)
+
+
+def docx_to_text(path: Path, *, max_chars: Optional[int] = None) -> str:
+    """Paragraphs joined by newlines; "" when the file is not a readable .docx."""
+    out = []
+    size = 0
+    try:
+        for para in iter_docx_paragraphs(path):
+            out.append(para)
+            size += len(para) + 1
+            if max_chars is not None and size >= max_chars:
+                break
+    except (OSError, KeyError, zipfile.BadZipFile, ET.ParseError):
+        return ""
+    text = "\n".join(out)
+    return text[:max_chars] if max_chars is not None else text
+
+
+# ---------------------------------------------------------------------------
+# HTML
+# ---------------------------------------------------------------------------
+
+_HTML_TAG_RE = re.compile(r"</?[A-Za-z][A-Za-z0-9-]*(?:\s[^<>]*)?/?>")
+_HTML_SKIP_TAGS = {"script", "style", "noscript", "template"}
+# Bump when html_to_text output changes so on-disk cache entries are not reused.
+_HTML_TEXT_VERSION = "1"
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _HTML_SKIP_TAGS:
+            self._skip += 1
+        elif tag == "br":
+            self.parts.append("\n")
+        else:
+            self.parts.append(" ")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == "br":
+            self.parts.append("\n")
+        elif tag not in _HTML_SKIP_TAGS:
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in _HTML_SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag == "p":
+            self.parts.append("\n\n")
+        elif tag == "li":
+            self.parts.append("\n")
+        else:
+            self.parts.append(" ")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(value: str) -> str:
+    """Visible text of an HTML document or fragment, one non-empty line per line.
+
+    ``<br>``, ``</p>`` and ``</li>`` start new lines, other tags become spaces,
+    script/style bodies and comments are dropped, entities are decoded and runs
+    of whitespace inside a line collapse to one space.
+    """
+    parser = _TextExtractor()
+    parser.feed(value or "")
+    parser.close()
+    lines = (" ".join(line.split()) for line in "".join(parser.parts).splitlines())
+    compact = [line for line in lines if line]
+    return "\n".join(compact) + ("\n" if compact else "")
+
+
+def looks_like_html(text: str) -> bool:
+    return _HTML_TAG_RE.search(text) is not None
+
+
+def cached_html_to_text(value: str, *, cache_dir: Optional[Path] = None) -> str:
+    """``html_to_text`` memoized on disk under ``cache_dir`` by content hash."""
+    if cache_dir is None:
+        return html_to_text(value)
+    raw = value.encode("utf-8", "surrogatepass")
+    digest = hashlib.blake2b(
+        raw, digest_size=16, person=f"html2txt-v{_HTML_TEXT_VERSION}".encode()
+    ).hexdigest()
+    path = Path(cache_dir) / digest[:2] / f"{digest}.txt"
+    try:
+        with path.open(encoding="utf-8", newline="") as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        pass
+    text = html_to_text(value)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return text
+
+
+# ---------------------------------------------------------------------------
+# Per-process artifact text cache
+# ---------------------------------------------------------------------------
+
+
+class ArtifactTextCache:
+    """Bounded LRU of extracted artifact text keyed by (path, size, mtime_ns)."""
+
+    def __init__(self, *, max_entries: int = 1024) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+
+    def get(self, path: Path, loader: Callable[[Path], str]) -> str:
+        try:
+            st = path.stat()
+        except OSError:
+            return ""
+        key = (str(path), st.st_size, st.st_mtime_ns)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return cached
+        self.misses += 1
+        text = loader(path)
+        self._entries[key] = text
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return text
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
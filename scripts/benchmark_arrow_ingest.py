@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Benchmark the Arrow-native tracker ingest against the per-row build path.
+
+Generates synthetic tracker CSVs (no company artifacts), then times, for each
+size, (a) parse + normalize and (b) the full CSV -> LanceDB table ingest of
+``rag/cli.py build`` (``--ingest rows`` vs ``--ingest arrow``). Index creation
+and retention are skipped; they are identical for both paths. Normalized
+fields are cross-checked row by row.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+_ROOT = Path(__file__).resolve().parents[1]
+_RAG = _ROOT / "rag"
+if str(_RAG) not in sys.path:
+    sys.path.insert(0, str(_RAG))
+
+import cli  # noqa: E402
+from arrow_ingest import normalize_tracker_table, read_tracker_table  # noqa: E402
+from memalign import normalize_row  # noqa: E402
+from shieldcortex import reset_gate_memo  # noqa: E402
+
+FIELDS = [
+    "Company",
+    "Role",
+    "Location",
+    "Status",
+    "Date Applied",
+    "Tags",
+    "Notes",
+    "Career Page URL",
+    "Cover Letter Used",
+    "Response",
+]
+_STATUSES = ["Applied", "applied", "Draft", " In Progress ", "Blocked", "Rejected", "", "Paused"]
+_ROLES = ["Senior ML Engineer", "Staff Platform Engineer", "AI Engineer (Agents)", "SRE II"]
+_HOSTS = [
+    "https://jobs.ashbyhq.com/{c}/{i}",
+    "https://job-boards.greenhouse.io/{c}/jobs/{i}",
+    "https://jobs.lever.co/{c}/{i}",
+    "https://{c}.wd5.myworkdayjobs.com/job/{i}",
+    "https://{c}.com/careers/{i}",
+]
+_TAGS = ["ai", "remote", "python", "infra", "llm", "react-native", "kubernetes"]
+
+
+def write_tracker(path: Path, n: int, *, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=FIELDS)
+        w.writeheader()
+        for i in range(n):
+            company = f"Company {i % max(1, n // 3)}"
+            c = company.lower().replace(" ", "")
+            w.writerow(
+                {
+                    "Company": company,
+                    "Role": rng.choice(_ROLES),
+                    "Location": rng.choice(["Remote", "NYC", "SF, CA"]),
+                    "Status": rng.choice(_STATUSES),
+                    "Date Applied": f"2026-0{1 + i % 9}-{1 + i % 28:02d}",
+                    "Tags": "; ".join(rng.sample(_TAGS, rng.randint(0, 4))),
+                    "Notes": f"note {i}, referral pending",
+                    "Career Page URL": rng.choice(_HOSTS).format(c=c, i=i),
+                    "Cover Letter Used": "",
+                    "Response": rng.choice(["", "", "Recruiter reached out"]),
+                }
+            )
+
+
+def _isolate(tmp: Path, tracker: Path) -> None:
+    cli.ROOT = tmp
+    cli.RAG_DIR = tmp / "rag"
+    cli.DATA_DIR = tmp / "rag" / "data"
+    cli.LOG_DIR = tmp / "rag" / "logs"
+    cli.LANCEDB_DIR = tmp / "rag" / "lancedb"
+    cli.APPLICATIONS_DIR = tmp / "applications"
+    cli.TRACKER_CSV = tracker
+    for d in (cli.DATA_DIR, cli.LOG_DIR, cli.LANCEDB_DIR, cli.APPLICATIONS_DIR):
+        d.mkdir(parents=True, exist_ok=True)
+
+
+def _create_table(data) -> None:
+    db = cli._lancedb_connect(str(cli.LANCEDB_DIR))
+    db.create_table(
+        "applications",
+        data=data,
+        schema=cli._applications_table_schema(),
+        mode="overwrite",
+        embedding_functions=cli._lancedb_embedding_functions(),
+    )
+
+
+def ingest_rows() -> int:
+    records, _errors = cli._build_records_from_rows(cli._load_tracker_rows())
+    _create_table(cli._record_items(records))
+    return len(records)
+
+
+def ingest_arrow() -> int:
+    records, _errors = cli._build_records_arrow()
+    _create_table(cli._records_arrow_table(records, cli._embedding_matrix(records)))
+    return len(records)
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def run_size(n: int) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as td:
+        tmp = Path(td)
+        tracker = tmp / "tracker.csv"
+        write_tracker(tracker, n)
+        _isolate(tmp, tracker)
+
+        rows_norm = _timed(lambda: [normalize_row(r) for r in cli._load_tracker_rows()])
+        arrow_norm = _timed(lambda: normalize_tracker_table(read_tracker_table(tracker)))
+
+        expected = [normalize_row(r) for r in cli._load_tracker_rows()]
+        got = normalize_tracker_table(read_tracker_table(tracker)).to_pylist()
+        keys = ("Status", "Tags", "app_id", "application_method")
+        mismatches = sum(
+            1
+            for e, g in zip(expected, got, strict=False)
+            if any(e[k] != g[k] for k in keys)
+        ) + abs(len(expected) - len(got))
+
+        reset_gate_memo()
+        rows_total = _timed(ingest_rows)
+        reset_gate_memo()
+        arrow_total = _timed(ingest_arrow)
+    return {
+        "rows": n,
+        "normalize_rows_s": rows_norm,
+        "normalize_arrow_s": arrow_norm,
+        "ingest_rows_s": rows_total,
+        "ingest_arrow_s": arrow_total,
+        "mismatches": mismatches,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,100000",
+        help="Comma-separated tracker sizes (default: 1000,10000,100000)",
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results: List[Dict[str, float]] = []
+    print(f"{'rows':>8}  {'normalize rows/arrow (s)':>26}  {'ingest rows/arrow (s)':>24}  speedup")
+    for n in sizes:
+        r = run_size(n)
+        results.append(r)
+        print(
+            f"{n:>8}  {r['normalize_rows_s']:>11.3f} / {r['normalize_arrow_s']:<11.3f}"
+            f"  {r['ingest_rows_s']:>10.2f} / {r['ingest_arrow_s']:<10.2f}"
+            f"  {r['normalize_rows_s'] / max(r['normalize_arrow_s'], 1e-9):5.1f}x"
+            f" / {r['ingest_rows_s'] / max(r['ingest_arrow_s'], 1e-9):4.2f}x"
+        )
+    bad = sum(int(r["mismatches"]) for r in results)
+    print(f"normalize mismatches: {bad}")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
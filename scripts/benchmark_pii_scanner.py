@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark the single-pass PII scanner against the multipass reference.
+
+Reads every text artifact under ``applications/`` (same suffixes and 300 KB
+cap as ``rag/cli.py scan``), checks that findings and redacted output match
+the multipass implementation byte for byte, and reports timings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+_ROOT = Path(__file__).resolve().parents[1]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+TEXT_SUFFIXES = {".md", ".txt", ".html", ".csv", ".jsonl"}
+MAX_BYTES = 300_000
+
+
+def _load_shieldcortex():
+    try:
+        from rag import shieldcortex
+
+        return shieldcortex
+    except ModuleNotFoundError as exc:
+        if exc.name not in {"rag", "rag.shieldcortex"}:
+            raise
+
+    module_path = _ROOT / "rag" / "shieldcortex.py"
+    spec = importlib.util.spec_from_file_location("_resume_rag_shieldcortex", module_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Failed to load shieldcortex from {module_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    return module
+
+
+sc = _load_shieldcortex()
+
+
+def load_corpus(root: Path) -> List[str]:
+    texts: List[str] = []
+    for path in sorted(root.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in TEXT_SUFFIXES:
+            continue
+        try:
+            raw = path.read_bytes()[:MAX_BYTES]
+        except OSError:
+            continue
+        text = raw.decode("utf-8", errors="ignore")
+        if text:
+            texts.append(text)
+    return texts
+
+
+def _multipass(text: str):
+    findings = sc._scan_pii_multipass(text)
+    return findings, (None if findings else sc._redact_multipass(text))
+
+
+def _single_pass(text: str):
+    matches = sc._scan_matches(text)
+    if matches is None:
+        return _multipass(text)
+    findings = sc._findings_from_matches(text, matches)
+    return findings, (None if findings else sc._redact_from_matches(text, matches))
+
+
+def _time(fn, texts: Sequence[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--corpus",
+        default=str(_ROOT / "applications"),
+        help="Directory to scan (default: applications/)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Best-of-N timing runs")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    texts = load_corpus(Path(args.corpus))
+    total_bytes = sum(len(t.encode("utf-8")) for t in texts)
+
+    mismatches = 0
+    fallbacks = 0
+    for text in texts:
+        if sc._scan_matches(text) is None:
+            fallbacks += 1
+        if _single_pass(text) != _multipass(text):
+            mismatches += 1
+
+    legacy_s = _time(_multipass, texts, args.repeat)
+    single_s = _time(_single_pass, texts, args.repeat)
+    mb = total_bytes / 1_000_000
+    print(f"corpus: {len(texts)} files, {mb:.2f} MB ({args.corpus})")
+    print(f"multipass:   {legacy_s * 1000:8.1f} ms  ({mb / max(legacy_s, 1e-9):6.1f} MB/s)")
+    print(f"single-pass: {single_s * 1000:8.1f} ms  ({mb / max(single_s, 1e-9):6.1f} MB/s)")
+    print(f"speedup: {legacy_s / max(single_s, 1e-9):.2f}x  fallbacks={fallbacks}")
+    print(f"mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
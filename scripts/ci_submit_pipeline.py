@@ -15,7 +15,6 @@ from __future__ import annotations
 import argparse
 import csv
 import datetime as dt
-import html
 import importlib.util
 import json
 import os
@@ -43,10 +42,10 @@ if str(_SCRIPT_ROOT) not in sys.path:
 
 def _load_learning_helpers() -> Tuple[Any, Any]:
     try:
-        from rag.learning import load_arms as load_arms
         from rag.learning import rank_rows_by_learning as rank_rows
+        from rag.learning import ranking_context_for as context_for
 
-        return load_arms, rank_rows
+        return context_for, rank_rows
     except ModuleNotFoundError as exc:
         if exc.name not in {"rag", "rag.learning"}:
             raise
@@ -58,10 +57,10 @@ def _load_learning_helpers() -> Tuple[Any, Any]:
     module = importlib.util.module_from_spec(spec)
     sys.modules[spec.name] = module
     spec.loader.exec_module(module)  # type: ignore[attr-defined]
-    return module.load_arms, module.rank_rows_by_learning
+    return module.ranking_context_for, module.rank_rows_by_learning
 
 
-_load_learning_arms, rank_rows_by_learning = _load_learning_helpers()
+_learning_context_for, rank_rows_by_learning = _load_learning_helpers()
 
 try:
     from playwright_stealth import stealth_sync  # type: ignore
@@ -234,11 +233,15 @@ def _rank_ready_rows_for_submit(
     max_jobs: int,
     arms_path: Path = DEFAULT_LEARNING_ARMS_JSON,
 ) -> Tuple[List[int], List[Dict[str, Any]]]:
+    # The context reloads arms.json only when it changes and keeps per-row
+    # features across cycles, so re-ranking after each cycle is cheap.
+    context = _learning_context_for(arms_path)
     ranked = rank_rows_by_learning(
         rows,
-        _load_learning_arms(arms_path),
+        context.arms,
         status_filter="ready",
         max_rows=max_jobs,
+        context=context,
     )
     indices = [int(item["row_index"]) for item in ranked]
     return indices, ranked
@@ -3395,16 +3398,27 @@ def _resolve_resume(company: str, role: str) -> Optional[Path]:
     return None
 
 
-def _html_to_text(value: str) -> str:
-    text = re.sub(r"(?is)<(script|style).*?>.*?</\\1>", " ", value or "")
-    text = re.sub(r"(?i)<br\\s*/?>", "\n", text)
-    text = re.sub(r"(?i)</p\\s*>", "\n\n", text)
-    text = re.sub(r"(?i)</li\\s*>", "\n", text)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = html.unescape(text)
-    lines = [re.sub(r"\\s+", " ", line).strip() for line in text.splitlines()]
-    compact = [line for line in lines if line]
-    return "\n".join(compact) + ("\n" if compact else "")
+def _load_html_to_text():
+    """Shared html.parser extractor from rag/textextract.py (package or file)."""
+    try:
+        from rag.textextract import html_to_text
+
+        return html_to_text
+    except ModuleNotFoundError as exc:
+        if exc.name not in {"rag", "rag.textextract"}:
+            raise
+
+    module_path = _SCRIPT_ROOT / "rag" / "textextract.py"
+    spec = importlib.util.spec_from_file_location("_resume_rag_textextract", module_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Failed to load text extraction helpers from {module_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    return module.html_to_text
+
+
+_html_to_text = _load_html_to_text()
 
 
 def _write_simple_docx(text: str, out_path: Path) -> None:
@@ -17,11 +17,12 @@ if str(_ROOT) not in sys.path:
 
 def _load_learning_helpers():
     try:
+        from rag.learning import append_learning_snapshot as append_snapshot
         from rag.learning import build_learning_report as build_report
         from rag.learning import load_arms as load_learning_arms
         from rag.learning import load_tracker_rows as load_rows
 
-        return build_report, load_learning_arms, load_rows
+        return build_report, load_learning_arms, load_rows, append_snapshot
     except ModuleNotFoundError as exc:
         if exc.name not in {"rag", "rag.learning"}:
             raise
@@ -33,16 +34,27 @@ def _load_learning_helpers():
     module = importlib.util.module_from_spec(spec)
     sys.modules[spec.name] = module
     spec.loader.exec_module(module)  # type: ignore[attr-defined]
-    return module.build_learning_report, module.load_arms, module.load_tracker_rows
+    return (
+        module.build_learning_report,
+        module.load_arms,
+        module.load_tracker_rows,
+        module.append_learning_snapshot,
+    )
 
 
-build_learning_report, load_arms, load_tracker_rows = _load_learning_helpers()
+(
+    build_learning_report,
+    load_arms,
+    load_tracker_rows,
+    append_learning_snapshot,
+) = _load_learning_helpers()
 
 
 ROOT = _ROOT
 DEFAULT_TRACKER = ROOT / "applications" / "job_applications" / "application_tracker.csv"
 DEFAULT_ARMS = ROOT / "rag" / "data" / "arms.json"
 DEFAULT_REPORT = ROOT / "applications" / "job_applications" / "rag_learning_report.json"
+DEFAULT_HISTORY_DIR = ROOT / "rag" / "data" / "history"
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -51,6 +63,16 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--arms", default=str(DEFAULT_ARMS), help="RLHF arms.json path")
     parser.add_argument("--report", default=str(DEFAULT_REPORT), help="Output JSON report path")
     parser.add_argument("--top-k", type=int, default=10, help="How many top rows/arms to include")
+    parser.add_argument(
+        "--history-dir",
+        default=str(DEFAULT_HISTORY_DIR),
+        help="Directory for the partitioned Parquet snapshot history",
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Do not append a snapshot to the history store",
+    )
     return parser
 
 
@@ -78,6 +100,13 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         encoding="utf-8",
     )
 
+    snapshot_path = None
+    if not args.no_history:
+        try:
+            snapshot_path = append_learning_snapshot(Path(args.history_dir), report, arms)
+        except RuntimeError as exc:
+            print(f"WARNING: learning history snapshot skipped: {exc}", file=sys.stderr)
+
     top_ready = report.get("ready_ranked", [])
     lead = top_ready[0] if top_ready else {}
     lead_text = (
@@ -92,6 +121,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         f"arms={report.get('total_arms', 0)} "
         f"top_ready={lead_text} "
         f"report={report_path}"
+        + (f" snapshot={snapshot_path}" if snapshot_path else "")
     )
     return 0
 
@@ -13,8 +13,10 @@ import csv
 import datetime as dt
 import hashlib
 import html
+import importlib.util
 import json
 import re
+import sys
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -237,16 +239,27 @@ def _replace_once(text: str, old: str, new: str) -> str:
     return text.replace(old, new, 1)
 
 
-def _html_to_text(value: str) -> str:
-    text = re.sub(r"(?is)<(script|style).*?>.*?</\\1>", " ", value or "")
-    text = re.sub(r"(?i)<br\\s*/?>", "\n", text)
-    text = re.sub(r"(?i)</p\\s*>", "\n\n", text)
-    text = re.sub(r"(?i)</li\\s*>", "\n", text)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = html.unescape(text)
-    lines = [re.sub(r"\\s+", " ", line).strip() for line in text.splitlines()]
-    compact = [line for line in lines if line]
-    return "\n".join(compact) + ("\n" if compact else "")
+def _load_html_to_text():
+    """Shared html.parser extractor from rag/textextract.py (package or file)."""
+    try:
+        from rag.textextract import html_to_text
+
+        return html_to_text
+    except ModuleNotFoundError as exc:
+        if exc.name not in {"rag", "rag.textextract"}:
+            raise
+
+    module_path = ROOT / "rag" / "textextract.py"
+    spec = importlib.util.spec_from_file_location("_resume_rag_textextract", module_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Failed to load text extraction helpers from {module_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    return module.html_to_text
+
+
+_html_to_text = _load_html_to_text()
 
 
 def _write_simple_docx(text: str, out_path: Path) -> None: